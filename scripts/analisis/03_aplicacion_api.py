@@ -12,11 +12,12 @@ import time
 import random
 import logging
 import requests
-import pyreadr
 import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 
+from rds_cache import cargar_rds
+
 try:
     from dotenv import load_dotenv
 except ImportError:  # pragma: no cover
@@ -66,6 +67,7 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 MIN_TOKENS     = 5
 MAX_CHARS_CTX  = 450
 MAX_CHARS_BODY = 450
+PALABRA_RE     = re.compile(r"\b\w{2,}\b")  # palabra de 2+ caracteres (cuenta para MIN_TOKENS)
 
 # ── Parámetros API ────────────────────────────────────────────────────────────
 TEMPERATURE   = 0.1
@@ -251,12 +253,30 @@ REGLA ESTRICTA:
 """
 
 # ==============================================================================
-# PREPARACIÓN DEL CORPUS
+# CARGA DE DATOS
 # ==============================================================================
-def es_texto_valido(texto: str) -> bool:
-    return len(re.findall(r"\b\w{2,}\b", texto)) >= MIN_TOKENS
+# Columnas muy repetidas (autor, subreddit): como categoría ocupan un código por fila
+COLS_CATEGORICAS = ["subreddit", "post_subreddit", "comment_author", "post_author", "post_flair"]
+# Versión de reducir_memoria para el caché Parquet del .rds: subirla al cambiar su lógica
+REDUCIR_MEMORIA_VERSION = "1|" + ",".join(COLS_CATEGORICAS)
+
+
+def reducir_memoria(df: pd.DataFrame) -> pd.DataFrame:
+    """Texto repetido -> category y columnas enteras (flags/conteos) -> el entero más chico que los contiene.
+
+    Las columnas float no se tocan aunque hoy traigan valores enteros (p.ej. puntajes).
+    Se aplica una vez, antes de escribir el caché Parquet.
+    """
+    for col in [c for c in COLS_CATEGORICAS if c in df.columns]:
+        df[col] = df[col].astype("category")
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
 
 
+# ==============================================================================
+# PREPARACIÓN DEL CORPUS
+# ==============================================================================
 def preparar_corpus(df: pd.DataFrame) -> pd.DataFrame:
     log.info("Preparando corpus...")
     col_body = "comment_body_clean" if "comment_body_clean" in df.columns else "comment_body"
@@ -299,7 +319,9 @@ def preparar_corpus(df: pd.DataFrame) -> pd.DataFrame:
     df["contexto_hilo"]     = (titulo + " " + selftext).str.strip().str[:MAX_CHARS_CTX]
     df["comentario_limpio"] = df[col_body].str.strip()
 
-    df = df[df["comentario_limpio"].apply(es_texto_valido)].copy()
+    # Palabras de 2+ caracteres contadas sobre toda la columna (sin llamada Python por fila)
+    n_palabras = df["comentario_limpio"].str.count(PALABRA_RE)
+    df = df[n_palabras >= MIN_TOKENS].copy()
     log.info(f"  Tras filtro longitud ({MIN_TOKENS} palabras): {len(df):,}")
 
     df["comentario_api"] = df["comentario_limpio"].str[:MAX_CHARS_BODY]
@@ -327,6 +349,14 @@ def preparar_corpus(df: pd.DataFrame) -> pd.DataFrame:
     return df[[c for c in cols_keep if c in df.columns]].reset_index(drop=True)
 
 
+def en_claves(df: pd.DataFrame, claves: set) -> pd.Series:
+    """Máscara: el par (post_id, comment_author) como texto está en `claves` (sin apply por fila)."""
+    if not claves:
+        return pd.Series(False, index=df.index)
+    pares = pd.MultiIndex.from_arrays([df["post_id"].astype(str), df["comment_author"].astype(str)])
+    return pd.Series(pares.isin(list(claves)), index=df.index)
+
+
 def _cuotas_proporcionales(n_total: int, sizes: list) -> list:
     total = sum(sizes)
     if total == 0 or n_total <= 0:
@@ -389,9 +419,7 @@ def muestra_proporcional_intercalada(
     if len(out) < n_objetivo:
         faltan = n_objetivo - len(out)
         ya = set(zip(out["post_id"].astype(str), out["comment_author"].astype(str)))
-        mask = ~df_corpus.apply(
-            lambda r: (str(r["post_id"]), str(r["comment_author"])) in ya, axis=1
-        )
+        mask = ~en_claves(df_corpus, ya)
         pool_extra = df_corpus.loc[mask]
         if len(pool_extra) > 0:
             extra = pool_extra.sample(
@@ -592,6 +620,10 @@ def hacer_llamadas(contexto: str, comentario: str,
 # ==============================================================================
 # CONSTRUIR FILA
 # ==============================================================================
+# \n y \r -> espacio en una sola pasada (una fila del CSV = un comentario)
+SALTOS_A_ESPACIO = str.maketrans("\r\n", "  ")
+
+
 def construir_fila(row: pd.Series, res: dict) -> dict:
     candidatos = row["candidatos_str"].split(", ")
     oa_a, ds_a = res["oa_a"], res["ds_a"]
@@ -616,9 +648,9 @@ def construir_fila(row: pd.Series, res: dict) -> dict:
         "n_candidatos":          row["n_candidatos"],
         "tipo_hilo":             row.get("tipo_hilo", ""),
         "contexto_hilo":         str(row.get("contexto_hilo", ""))[:200]
-                                 .replace("\n", " ").replace("\r", " "),
+                                 .translate(SALTOS_A_ESPACIO),
         "comentario_texto":      str(row.get("comentario_api", ""))
-                                 .replace("\n", " ").replace("\r", " "),
+                                 .translate(SALTOS_A_ESPACIO),
         "oa_polarizacion":       pol_oa,
         "ds_polarizacion":       pol_ds,
         "polarizacion_consenso": pol_consenso,
@@ -680,10 +712,7 @@ def clasificar_con_checkpoint(df: pd.DataFrame) -> None:
         except Exception as e:
             log.warning(f"No se pudo leer checkpoint: {e}")
 
-    pendientes = df[
-        ~df.apply(lambda r: (str(r["post_id"]), str(r["comment_author"])) in ya_procesados,
-                  axis=1)
-    ].copy()
+    pendientes = df[~en_claves(df, ya_procesados)].copy()
 
     log.info(f"Pendientes: {len(pendientes):,}")
     if len(pendientes) == 0:
@@ -811,8 +840,7 @@ if __name__ == "__main__":
 
     log.info(f"Cargando {RDS_PATH} ...")
     try:
-        rds    = pyreadr.read_r(str(RDS_PATH))
-        df_raw = next(iter(rds.values()))
+        df_raw = cargar_rds(RDS_PATH, preparar=reducir_memoria, version=REDUCIR_MEMORIA_VERSION)
         log.info(f"Filas: {len(df_raw):,} | Columnas: {list(df_raw.columns)}")
     except Exception as e:
         log.error(f"Error cargando datos: {e}")
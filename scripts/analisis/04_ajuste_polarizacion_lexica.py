@@ -31,12 +31,13 @@ OUTPUT_PATH = DATA_DIR / "analisis_API_ajustado.csv"
 
 DEFAULT_BOOST_FACTOR = 1.6
 POLAR_COLS = ["oa_polarizacion", "ds_polarizacion", "polarizacion_consenso"]
+COMBINING_RE = re.compile(r"[\u0300-\u036f]")  # acentos y diacriticos tras NFKD
 
 
 def normalize_text(text: str) -> str:
-    text = "" if pd.isna(text) else str(text)
+    # Recibe siempre str: los nulos se resuelven una vez sobre la columna completa en main()
     text = unicodedata.normalize("NFKD", text)
-    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = COMBINING_RE.sub("", text)
     return text.lower()
 
 
@@ -70,6 +71,7 @@ def load_lexicon(path: Path) -> list[dict]:
         items.append(
             {
                 "pattern": raw,
+                "key": key,  # patron normalizado, calculado una sola vez al cargar
                 "regex": pattern_to_regex(raw),
                 "multiplier": multiplier,
                 "categoria": category,
@@ -80,19 +82,14 @@ def load_lexicon(path: Path) -> list[dict]:
 
 def detect_hostile_terms(text: str, lexicon: list[dict]) -> list[dict]:
     norm_text = normalize_text(text)
-    hits = []
+    dedup = {}
     for item in lexicon:
         if item["regex"].search(norm_text):
-            hits.append(
-                {
-                    "pattern": item["pattern"],
-                    "multiplier": item["multiplier"],
-                    "categoria": item["categoria"],
-                }
-            )
-    dedup = {}
-    for hit in hits:
-        dedup[normalize_text(hit["pattern"])] = hit
+            dedup[item["key"]] = {
+                "pattern": item["pattern"],
+                "multiplier": item["multiplier"],
+                "categoria": item["categoria"],
+            }
     return sorted(dedup.values(), key=lambda x: x["pattern"])
 
 
@@ -127,11 +124,17 @@ def main() -> None:
             df[col] = pd.to_numeric(df[col], errors="coerce")
             df[f"{col}_original"] = df[col]
 
-    hits = df[text_col].fillna("").apply(lambda txt: detect_hostile_terms(txt, lexicon))
-    df["ajuste_lexico_hostil"] = hits.apply(lambda x: int(len(x) > 0))
-    df["ajuste_lexico_terminos"] = hits.apply(lambda x: " | ".join(hit["pattern"] for hit in x))
-    df["ajuste_lexico_categorias"] = hits.apply(lambda x: " | ".join(sorted({hit["categoria"] for hit in x})))
-    df["ajuste_lexico_factor"] = hits.apply(lambda x: max([hit["multiplier"] for hit in x], default=1.0))
+    # Cada texto distinto se analiza una sola vez; los resultados se reparten con los codigos
+    codes, uniques = pd.factorize(df[text_col].fillna("").astype(str))
+    hits = pd.Series([detect_hostile_terms(txt, lexicon) for txt in uniques], dtype=object)
+    ajuste = pd.DataFrame({
+        "ajuste_lexico_hostil": hits.apply(lambda x: int(len(x) > 0)),
+        "ajuste_lexico_terminos": hits.apply(lambda x: " | ".join(hit["pattern"] for hit in x)),
+        "ajuste_lexico_categorias": hits.apply(lambda x: " | ".join(sorted({hit["categoria"] for hit in x}))),
+        "ajuste_lexico_factor": hits.apply(lambda x: max([hit["multiplier"] for hit in x], default=1.0)),
+    })
+    for col in ajuste.columns:
+        df[col] = ajuste[col].to_numpy()[codes]
 
     mask = df["ajuste_lexico_hostil"].eq(1)
     for col in POLAR_COLS:
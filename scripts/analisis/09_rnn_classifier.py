@@ -9,6 +9,7 @@ import sys
 import torch
 import torch.nn as nn
 import torch.optim as optim
+import torch.multiprocessing as mp
 from torch.utils.data import Dataset, DataLoader
 import pandas as pd
 import numpy as np
@@ -20,9 +21,13 @@ from sklearn.metrics import (
 from sklearn.preprocessing import LabelEncoder
 import re
 from collections import Counter
+from itertools import chain
 from tqdm import tqdm
 from pathlib import Path
 import gc
+import hashlib
+
+from rds_cache import cargar_rds
 
 # Configuración
 RANDOM_SEED = 123
@@ -51,12 +56,14 @@ MAX_LENGTH = 120  # Reducido para estabilidad
 BATCH_SIZE = 16  # Reducido para datasets pequeños
 LEARNING_RATE = 0.0003  # Reducido para estabilidad (era 0.001)
 NUM_EPOCHS = 10
+ENCODER = "lstm"  # "lstm" (BiLSTM, resultados de la tesis) | "cnn" (Conv1d, paralelo en GPU)
 
 # Configuración de datos
 USE_COMMENT_ONLY = False  # True = solo comment_texto, False = texto_completo
 
 # Device
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+USE_AMP = device.type == "cuda"  # Precisión mixta (autocast FP16 + GradScaler) solo en GPU
 print(f"Using device: {device}")
 
 # =============================================================
@@ -69,11 +76,9 @@ test_file = os.path.join(DATA_DIR, "test_analisis_discurso.rds")
 completo_file = os.path.join(DATA_DIR, "analisis_discurso_completo.rds")
 
 if os.path.exists(test_file):
-    # Leer archivo RDS usando pyreadr o rpy2
+    # Leer archivo RDS usando pyreadr (caché Parquet desde la segunda corrida)
     try:
-        import pyreadr
-        result = pyreadr.read_r(test_file)
-        df = result[list(result.keys())[0]]
+        df = cargar_rds(test_file)
         print(f"✓ Datos cargados desde test_analisis_discurso.rds")
     except ImportError:
         print("pyreadr no disponible, intentando con pandas (requiere conversión previa)")
@@ -85,9 +90,7 @@ if os.path.exists(test_file):
             raise FileNotFoundError("No se encontró archivo de datos")
 elif os.path.exists(completo_file):
     try:
-        import pyreadr
-        result = pyreadr.read_r(completo_file)
-        df = result[list(result.keys())[0]]
+        df = cargar_rds(completo_file)
         print(f"✓ Datos cargados desde analisis_discurso_completo.rds")
     except ImportError:
         csv_file = os.path.join(DATA_DIR, "analisis_discurso_completo.csv")
@@ -98,6 +101,10 @@ elif os.path.exists(completo_file):
 else:
     raise FileNotFoundError("No se encontraron datos de análisis de discurso")
 
+# Solo las columnas que usa el modelo: filtros y copias posteriores no arrastran el resto
+COLUMNAS_USADAS = ['procesado', 'error', 'us_vs_them_marker', 'texto_completo', 'comment_texto']
+df = df[[c for c in COLUMNAS_USADAS if c in df.columns]]
+
 # Preparar datos
 df_ml = df[
     (df['procesado'] == True) & 
@@ -133,23 +140,29 @@ if len(df_ml) < 100:
 # =============================================================
 print("\n=== Definiendo vocabulario ===")
 
+# Remover caracteres especiales, mantener solo letras y espacios
+TOKEN_RE = re.compile(r'[^a-záéíóúñü\s]')
+
 def simple_tokenizer(text, lower=True):
     """Tokenizador simple"""
     if lower:
         text = text.lower()
-    # Remover caracteres especiales, mantener solo letras y espacios
-    text = re.sub(r'[^a-záéíóúñü\s]', ' ', text)
+    text = TOKEN_RE.sub(' ', text)
     tokens = text.split()
     return tokens
 
-# Construir vocabulario
-all_tokens = []
-for text in df_ml['text']:
-    tokens = simple_tokenizer(str(text))
-    all_tokens.extend(tokens)
+def tokenize_series(texts, lower=True):
+    """Tokenizador vectorizado: misma regla que simple_tokenizer sobre toda la Serie"""
+    texts = texts.astype(str)
+    if lower:
+        texts = texts.str.lower()
+    return texts.str.replace(TOKEN_RE, ' ', regex=True).str.split()
 
-# Contar frecuencias
-token_counts = Counter(all_tokens)
+# Tokenizar una sola vez (se reutiliza en los Dataset, no se re-tokeniza por epoch)
+df_ml['tokens'] = tokenize_series(df_ml['text'])
+
+# Contar frecuencias en una pasada (sin materializar una lista con todos los tokens)
+token_counts = Counter(chain.from_iterable(df_ml['tokens'].to_numpy()))
 
 # Crear vocabulario (palabras más frecuentes + tokens especiales)
 vocab = {
@@ -174,32 +187,58 @@ print(f"Tamaño del vocabulario: {len(vocab)}")
 class DiscourseDataset(Dataset):
     """Dataset para análisis de discurso"""
     
-    def __init__(self, texts, targets, vocab, max_length=MAX_LENGTH):
-        self.texts = texts
-        self.targets = targets
+    def __init__(self, tokens, targets, vocab, max_length=MAX_LENGTH, cache_path=None, cache_key=None):
         self.vocab = vocab
         self.max_length = max_length
+        self.targets = np.asarray(targets, dtype=np.int64)
+        
+        # Reutilizar la matriz de ids de una ejecución anterior (memmap, sin copiar a RAM)
+        # solo si la clave guardada junto al .npy coincide con la actual
+        key_path = Path(str(cache_path) + ".key") if cache_path is not None else None
+        if (cache_path is not None and os.path.exists(cache_path) and key_path.exists()
+                and key_path.read_text() == cache_key):
+            self.ids = np.load(cache_path, mmap_mode='r')
+            return
+        
+        # Pre-tokenizar y pre-padear una sola vez: matriz (N, max_length) int32
+        # rellena con <PAD>; __getitem__ solo indexa la fila correspondiente
+        unk = vocab['<UNK>']
+        self.ids = np.full((len(tokens), max_length), vocab['<PAD>'], dtype=np.int32)
+        truncated = [toks[:max_length] for toks in tokens]
+        lengths = np.fromiter((len(toks) for toks in truncated), dtype=np.int64, count=len(truncated))
+        # token -> id en una sola llamada: las categorías siguen el orden de vocab,
+        # así el código de cada token es su índice (-1 = fuera de vocabulario)
+        codes = pd.Categorical(list(chain.from_iterable(truncated)), categories=list(vocab)).codes
+        codes = np.where(codes < 0, unk, codes)
+        # Ubicar cada id en (fila, posición) de la matriz
+        rows = np.repeat(np.arange(len(truncated)), lengths)
+        cols = np.arange(len(codes)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.ids[rows, cols] = codes
+        if cache_path is not None:
+            # Un archivo fijo por split: se sobrescribe en vez de acumular un .npy por clave
+            np.save(cache_path, self.ids)
+            key_path.write_text(cache_key)
     
     def __len__(self):
-        return len(self.texts)
+        return len(self.ids)
     
     def __getitem__(self, idx):
-        text = str(self.texts.iloc[idx])
-        target = self.targets.iloc[idx]
-        
-        # Tokenizar
-        tokens = simple_tokenizer(text)
-        
-        # Convertir a índices
-        indices = [self.vocab.get(token, self.vocab['<UNK>']) for token in tokens]
-        
-        # Truncar o pad
-        if len(indices) > self.max_length:
-            indices = indices[:self.max_length]
-        else:
-            indices = indices + [self.vocab['<PAD>']] * (self.max_length - len(indices))
-        
-        return torch.tensor(indices, dtype=torch.long), torch.tensor(target, dtype=torch.long)
+        # astype copia la fila (el memmap es de solo lectura)
+        return torch.from_numpy(self.ids[idx].astype(np.int64)), torch.tensor(self.targets[idx])
+
+def ids_cache(split_df, name):
+    """
+    Caché .npy de ids para un split: (ruta fija por split, clave). La clave cambia si
+    cambian textos, vocabulario o MAX_LENGTH y se guarda junto al .npy.
+    """
+    h = hashlib.sha256()
+    h.update(f"{VOCAB_SIZE}|{MAX_LENGTH}|{split_df.shape}".encode())
+    h.update("\n".join(vocab).encode())
+    h.update(pd.util.hash_pandas_object(split_df['text'], index=False).values.tobytes())
+    # Limpiar cachés de versiones anteriores, que llevaban la clave en el nombre
+    for stale in OUT_DIR.glob(f"rnn_ids_{name}_*.npy"):
+        stale.unlink()
+    return OUT_DIR / f"rnn_ids_{name}.npy", h.hexdigest()
 
 # División train/val/test (CORREGIDO: separar test del val)
 # Primero separar test
@@ -242,24 +281,34 @@ print(f"Distribución Val:\n{val_df['target'].value_counts()}")
 print(f"Distribución Test:\n{test_df['target'].value_counts()}")
 
 # Crear datasets
+train_cache, train_key = ids_cache(train_df, "train")
+val_cache, val_key = ids_cache(val_df, "val")
+test_cache, test_key = ids_cache(test_df, "test")
+
 train_dataset = DiscourseDataset(
-    train_df['text'], 
+    train_df['tokens'], 
     train_df['target'], 
     vocab, 
-    max_length=MAX_LENGTH
+    max_length=MAX_LENGTH,
+    cache_path=train_cache,
+    cache_key=train_key
 )
 val_dataset = DiscourseDataset(
-    val_df['text'],
+    val_df['tokens'],
     val_df['target'],
     vocab,
-    max_length=MAX_LENGTH
+    max_length=MAX_LENGTH,
+    cache_path=val_cache,
+    cache_key=val_key
 )
 
 test_dataset = DiscourseDataset(
-    test_df['text'], 
+    test_df['tokens'], 
     test_df['target'], 
     vocab, 
-    max_length=MAX_LENGTH
+    max_length=MAX_LENGTH,
+    cache_path=test_cache,
+    cache_key=test_key
 )
 
 # DataLoaders (ajustar batch_size si es muy grande para el dataset)
@@ -267,32 +316,50 @@ actual_batch_size = min(BATCH_SIZE, len(train_dataset))
 if actual_batch_size < BATCH_SIZE:
     print(f"Advertencia: Batch size ajustado a {actual_batch_size} (dataset pequeño)")
 
-train_loader = DataLoader(train_dataset, batch_size=actual_batch_size, shuffle=True)
-val_loader = DataLoader(val_dataset, batch_size=actual_batch_size, shuffle=False)
-test_loader = DataLoader(test_dataset, batch_size=actual_batch_size, shuffle=False)
+# Workers solo con start method "fork": con "spawn" (macOS/Windows) cada worker
+# re-importa este script sin guardia __main__ y lo ejecutaría completo
+num_workers = min(4, os.cpu_count() or 1) if mp.get_start_method() == "fork" else 0
+loader_kwargs = dict(
+    batch_size=actual_batch_size,
+    num_workers=num_workers,
+    pin_memory=(device.type == "cuda"),
+    persistent_workers=num_workers > 0,
+)
+
+train_loader = DataLoader(train_dataset, shuffle=True, **loader_kwargs)
+val_loader = DataLoader(val_dataset, shuffle=False, **loader_kwargs)
+test_loader = DataLoader(test_dataset, shuffle=False, **loader_kwargs)
 
-print(f"✓ DataLoaders creados")
+print(f"✓ DataLoaders creados (num_workers={num_workers})")
 
 # =============================================================
 # 4) Definir Red Recurrente (LSTM)
 # =============================================================
 class RNNClassifier(nn.Module):
-    """Clasificador basado en LSTM"""
+    """Clasificador basado en LSTM (o Conv1d con encoder="cnn")"""
     
-    def __init__(self, vocab_size, embedding_dim, hidden_dim, num_layers, num_classes, dropout=0.3):
+    def __init__(self, vocab_size, embedding_dim, hidden_dim, num_layers, num_classes, dropout=0.3,
+                 encoder="lstm"):
         super(RNNClassifier, self).__init__()
         
+        self.encoder = encoder
         self.embedding = nn.Embedding(vocab_size, embedding_dim, padding_idx=0)
         
-        # LSTM bidireccional (SIMPLIFICADO: sin atención para mayor estabilidad)
-        self.lstm = nn.LSTM(
-            embedding_dim,
-            hidden_dim,
-            num_layers,
-            batch_first=True,
-            bidirectional=True,
-            dropout=dropout if num_layers > 1 else 0
-        )
+        if encoder == "cnn":
+            # Conv1d sobre embeddings: todos los pasos en paralelo (GEMM), misma salida hidden_dim * 2
+            self.conv = nn.Conv1d(embedding_dim, hidden_dim * 2, kernel_size=3, padding=1)
+        elif encoder == "lstm":
+            # LSTM bidireccional (SIMPLIFICADO: sin atención para mayor estabilidad)
+            self.lstm = nn.LSTM(
+                embedding_dim,
+                hidden_dim,
+                num_layers,
+                batch_first=True,
+                bidirectional=True,
+                dropout=dropout if num_layers > 1 else 0
+            )
+        else:
+            raise ValueError(f"encoder no soportado: {encoder}")
         
         # Capas fully connected (simplificado)
         self.fc1 = nn.Linear(hidden_dim * 2, hidden_dim)  # *2 por bidireccional
@@ -301,16 +368,35 @@ class RNNClassifier(nn.Module):
         self.relu = nn.ReLU()
     
     def forward(self, X_batch):
+        # Largo real de cada secuencia (el padding va al final, índice 0);
+        # mínimo 1 porque pack_padded_sequence no acepta secuencias vacías
+        lengths = (X_batch != 0).sum(dim=1).clamp(min=1)
+        
         # Embedding
         embedded = self.embedding(X_batch)  # (batch_size, seq_len, embedding_dim)
         
-        # LSTM
-        lstm_out, (hidden, cell) = self.lstm(embedded)
-        # lstm_out: (batch_size, seq_len, hidden_dim * 2)
+        if self.encoder == "cnn":
+            conv_out = self.relu(self.conv(embedded.transpose(1, 2)))  # (batch_size, hidden_dim * 2, seq_len)
+            # Max pooling solo sobre tokens reales
+            pad_mask = (X_batch == 0).unsqueeze(1)
+            pooled = conv_out.masked_fill(pad_mask, float("-inf")).max(dim=2).values
+            pooled = torch.nan_to_num(pooled, neginf=0.0)  # filas sin tokens
+            return self._head(pooled)
+        
+        # LSTM sobre secuencias empaquetadas: no procesa los pasos de <PAD>
+        packed = nn.utils.rnn.pack_padded_sequence(
+            embedded, lengths.cpu(), batch_first=True, enforce_sorted=False
+        )
+        packed_out, (hidden, cell) = self.lstm(packed)
+        lstm_out, _ = nn.utils.rnn.pad_packed_sequence(packed_out, batch_first=True)
+        # lstm_out: (batch_size, max_len_batch, hidden_dim * 2), ceros en posiciones de padding
         
-        # Pooling: usar mean pooling (más estable que atención para datasets pequeños)
-        pooled = torch.mean(lstm_out, dim=1)  # (batch_size, hidden_dim * 2)
+        # Pooling: mean pooling solo sobre tokens reales (más estable que atención para datasets pequeños)
+        pooled = lstm_out.sum(dim=1) / lengths.unsqueeze(1).to(lstm_out.dtype)  # (batch_size, hidden_dim * 2)
         
+        return self._head(pooled)
+    
+    def _head(self, pooled):
         # Fully connected
         out = self.fc1(pooled)
         out = self.relu(out)
@@ -326,13 +412,37 @@ model = RNNClassifier(
     hidden_dim=HIDDEN_DIM,
     num_layers=NUM_LAYERS,
     num_classes=NUM_CLASSES,
-    dropout=0.3
+    dropout=0.3,
+    encoder=ENCODER
 ).to(device)
 
 print(f"\n=== Modelo creado ===")
 print(f"Parámetros totales: {sum(p.numel() for p in model.parameters()):,}")
 print(f"Parámetros entrenables: {sum(p.numel() for p in model.parameters() if p.requires_grad):,}")
 
+# torch.compile (PyTorch >= 2.0, solo CUDA): fusiona embedding + encoder + FC en menos kernels.
+# Solo para el encoder CNN: el camino LSTM empaqueta secuencias con largos dependientes de
+# los datos, lo que rompe el grafo y recompila en cada patrón de largos. dynamic=True evita
+# recompilar por el tamaño del último batch. La compilación es perezosa, así que se prueba
+# con un paso forward+backward sobre un batch sintético de padding (no consume train_loader
+# ni, con fork_rng, el estado aleatorio del dropout) y si falla se sigue en modo eager.
+# Los parámetros son compartidos con el módulo original; se guarda su state_dict sin prefijo _orig_mod.
+if device.type == "cuda" and ENCODER == "cnn" and hasattr(torch, "compile"):
+    compiled = torch.compile(model, dynamic=True)
+    try:
+        X0 = torch.zeros(2, MAX_LENGTH, dtype=torch.long, device=device)
+        with torch.random.fork_rng(devices=[device]):
+            with torch.autocast(device_type=device.type, dtype=torch.float16, enabled=USE_AMP):
+                out0 = compiled(X0)
+            out0.float().sum().backward()
+        model.zero_grad(set_to_none=True)
+        model = compiled
+        print("✓ Modelo compilado con torch.compile")
+    except Exception as e:
+        model.zero_grad(set_to_none=True)
+        torch._dynamo.reset()
+        print(f"torch.compile falló, se usa modo eager: {e}")
+
 # =============================================================
 # 5) Funciones de Entrenamiento y Evaluación
 # =============================================================
@@ -340,21 +450,21 @@ def CalcValLossAndAccuracy(model, loss_fn, val_loader):
     """Calcular pérdida y accuracy en validación"""
     model.eval()
     with torch.no_grad():
-        Y_shuffled, Y_preds, losses = [], [], []
+        # Acumuladores en el dispositivo: una sola sincronización al final
+        loss_sum = torch.zeros((), device=device)
+        correct = torch.zeros((), dtype=torch.long, device=device)
+        n_batches, n_samples = 0, 0
         for X, Y in val_loader:
-            X, Y = X.to(device), Y.to(device)
+            X, Y = X.to(device, non_blocking=True), Y.to(device, non_blocking=True)
             preds = model(X)
             loss = loss_fn(preds, Y)
-            losses.append(loss.item())
-            
-            Y_shuffled.append(Y.cpu())
-            Y_preds.append(preds.argmax(dim=-1).cpu())
-        
-        Y_shuffled = torch.cat(Y_shuffled)
-        Y_preds = torch.cat(Y_preds)
+            loss_sum += loss
+            correct += (preds.argmax(dim=-1) == Y).sum()
+            n_batches += 1
+            n_samples += len(Y)
         
-        val_loss = torch.tensor(losses).mean().item()
-        val_acc = accuracy_score(Y_shuffled.numpy(), Y_preds.numpy())
+        val_loss = loss_sum.item() / n_batches
+        val_acc = correct.item() / n_samples
         
         print(f"Valid Loss : {val_loss:.3f}")
         print(f"Valid Acc  : {val_acc:.3f}")
@@ -366,23 +476,28 @@ def TrainModel(model, loss_fn, optimizer, train_loader, val_loader, epochs=10, p
     model.train()
     best_val_loss = float('inf')
     patience_counter = 0
+    # Escalado de pérdida para FP16 (no-op en CPU)
+    scaler = torch.amp.GradScaler("cuda", enabled=USE_AMP)
     
     for i in range(1, epochs + 1):
         losses = []
         for X, Y in tqdm(train_loader, desc=f"Epoch {i}/{epochs}"):
-            X, Y = X.to(device), Y.to(device)
+            X, Y = X.to(device, non_blocking=True), Y.to(device, non_blocking=True)
             
-            # Forward pass
-            Y_preds = model(X)
-            loss = loss_fn(Y_preds, Y)
+            # Forward pass (precisión mixta en CUDA)
+            with torch.autocast(device_type=device.type, dtype=torch.float16, enabled=USE_AMP):
+                Y_preds = model(X)
+                loss = loss_fn(Y_preds, Y)
             losses.append(loss.item())
             
             # Backward pass
             optimizer.zero_grad()
-            loss.backward()
-            # Gradient clipping para estabilidad
+            scaler.scale(loss).backward()
+            # Gradient clipping para estabilidad (sobre gradientes des-escalados)
+            scaler.unscale_(optimizer)
             torch.nn.utils.clip_grad_norm_(model.parameters(), max_norm=1.0)
-            optimizer.step()
+            scaler.step(optimizer)
+            scaler.update()
         
         train_loss = torch.tensor(losses).mean().item()
         print(f"Train Loss : {train_loss:.3f}")
@@ -394,7 +509,7 @@ def TrainModel(model, loss_fn, optimizer, train_loader, val_loader, epochs=10, p
             patience_counter = 0
             # Guardar mejor modelo
             best_model_path = os.path.join(OUT_DIR, "rnn_best_model.pt")
-            torch.save(model.state_dict(), best_model_path)
+            torch.save(model.state_dict(), best_model_path, _use_new_zipfile_serialization=True)
         else:
             patience_counter += 1
             if patience_counter >= patience:
@@ -402,31 +517,31 @@ def TrainModel(model, loss_fn, optimizer, train_loader, val_loader, epochs=10, p
                 # Cargar mejor modelo si existe
                 best_model_path = os.path.join(OUT_DIR, "rnn_best_model.pt")
                 if os.path.exists(best_model_path):
-                    model.load_state_dict(torch.load(best_model_path))
+                    model.load_state_dict(torch.load(best_model_path, map_location=device, weights_only=True))
                 break
         
         model.train()  # Volver a modo entrenamiento
 
 def MakePredictions(model, loader):
-    """Hacer predicciones"""
+    """Hacer predicciones: devuelve (y_true, y_pred, y_prob) en una sola pasada"""
     model.eval()
     Y_shuffled, Y_preds = [], []
     with torch.no_grad():
         for X, Y in loader:
-            X, Y = X.to(device), Y.to(device)
+            X = X.to(device, non_blocking=True)
             preds = model(X)
             Y_preds.append(preds)
-            Y_shuffled.append(Y.cpu())
+            Y_shuffled.append(Y)
     
     gc.collect()
     Y_preds = torch.cat(Y_preds)
     Y_shuffled = torch.cat(Y_shuffled)
     
     # Softmax y argmax
-    Y_preds_probs = torch.softmax(Y_preds, dim=-1)
-    Y_preds_classes = Y_preds_probs.argmax(dim=-1).cpu().numpy()
+    Y_preds_probs = torch.softmax(Y_preds.float(), dim=-1)
+    Y_preds_classes = Y_preds_probs.argmax(dim=-1)
     
-    return Y_shuffled.numpy(), Y_preds_classes
+    return Y_shuffled.numpy(), Y_preds_classes.numpy(force=True), Y_preds_probs.numpy(force=True)
 
 # =============================================================
 # 6) Entrenamiento del Modelo
@@ -450,7 +565,7 @@ TrainModel(model, loss_fn, optimizer, train_loader, val_loader, epochs=NUM_EPOCH
 # Guardar modelo
 model_path = os.path.join(OUT_DIR, "rnn_classifier.pt")
 torch.save({
-    'model_state_dict': model.state_dict(),
+    'model_state_dict': getattr(model, '_orig_mod', model).state_dict(),
     'vocab': vocab,
     'idx_to_word': idx_to_word,
     'model_params': {
@@ -458,9 +573,10 @@ torch.save({
         'embedding_dim': EMBEDDING_DIM,
         'hidden_dim': HIDDEN_DIM,
         'num_layers': NUM_LAYERS,
-        'num_classes': NUM_CLASSES
+        'num_classes': NUM_CLASSES,
+        'encoder': ENCODER
     }
-}, model_path)
+}, model_path, _use_new_zipfile_serialization=True)
 print(f"\n✓ Modelo guardado en: {model_path}")
 
 # =============================================================
@@ -468,7 +584,8 @@ print(f"\n✓ Modelo guardado en: {model_path}")
 # =============================================================
 print("\n=== Evaluando modelo ===")
 
-Y_actual, Y_preds = MakePredictions(model, test_loader)
+Y_actual, Y_preds, Y_probs_all = MakePredictions(model, test_loader)
+Y_probs = Y_probs_all[:, 1]  # Probabilidad de clase 1 (Polarizado)
 
 # Métricas completas (CORREGIDO: agregar macro-F1, balanced accuracy, PR-AUC)
 accuracy = accuracy_score(Y_actual, Y_preds)
@@ -477,20 +594,8 @@ macro_f1 = f1_score(Y_actual, Y_preds, average='macro', zero_division=0)
 weighted_f1 = f1_score(Y_actual, Y_preds, average='weighted', zero_division=0)
 
 # PR-AUC (asumiendo que clase 1 es "Polarizado" - la positiva)
-# Necesitamos probabilidades, no solo predicciones
-model.eval()
-Y_probs = []
-Y_actual_for_pr = []
-with torch.no_grad():
-    for X, Y in test_loader:
-        X = X.to(device)
-        preds = model(X)
-        probs = torch.softmax(preds, dim=-1)
-        Y_probs.extend(probs[:, 1].cpu().numpy())  # Probabilidad de clase 1 (Polarizado)
-        Y_actual_for_pr.extend(Y.numpy())
-
-Y_actual_for_pr = np.array(Y_actual_for_pr)
-Y_probs = np.array(Y_probs)
+# Las probabilidades salen de la misma pasada de MakePredictions
+Y_actual_for_pr = Y_actual
 
 # PR-AUC por clase y macro promedio
 try:
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Lectura de .rds con caché Parquet, compartida por 03_aplicacion_api.py y 09_rnn_classifier.py."""
+
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+
+def cargar_rds(path, preparar=None, version="") -> pd.DataFrame:
+    """Lee un .rds vía caché Parquet junto al archivo.
+
+    `preparar` (opcional) se aplica una sola vez, antes de escribir el caché: las lecturas
+    siguientes ya lo traen aplicado. El caché se regenera si el .rds es más nuevo o si
+    cambia la clave de preparación (nombre de `preparar` + `version`), guardada en un
+    archivo .key hermano; subir `version` al cambiar lo que hace `preparar`.
+    Si falta pyreadr se propaga el ImportError.
+    """
+    path = Path(path)
+    parquet = path.with_suffix(".parquet")
+    key_path = parquet.with_name(parquet.name + ".key")
+    key = f"{preparar.__qualname__}:{version}" if preparar is not None else f"-:{version}"
+    if (parquet.exists() and parquet.stat().st_mtime >= path.stat().st_mtime
+            and key_path.exists() and key_path.read_text(encoding="utf-8") == key):
+        log.info(f"  Usando caché {parquet.name}")
+        return pd.read_parquet(parquet, engine="pyarrow")
+
+    import pyreadr
+    rds = pyreadr.read_r(str(path))
+    df = next(iter(rds.values()))
+    if preparar is not None:
+        df = preparar(df)
+    try:
+        df.to_parquet(parquet, index=False, engine="pyarrow", compression="zstd")
+        key_path.write_text(key, encoding="utf-8")
+        log.info(f"  Caché Parquet escrito: {parquet.name}")
+    except Exception as e:
+        # No fallar si solo falla el caché (p.ej. pyarrow no instalado)
+        log.warning(f"  No se pudo escribir caché Parquet: {e}")
+    return df
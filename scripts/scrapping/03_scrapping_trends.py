@@ -14,6 +14,7 @@ Mejoras de manejo de errores:
 """
 
 from datetime import date, timedelta, datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Tuple
 import time
@@ -23,6 +24,7 @@ import traceback
 import logging
 import os
 import shutil
+import signal
 
 # NOTE: The following line is not valid Python code and will cause a syntax error.
 # To install pytrends, run the following command in your terminal, not in your .py file:
@@ -31,11 +33,18 @@ import shutil
 #    pip install pytrends
 
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytrends.request
 from pytrends.request import TrendReq
 from pytrends.exceptions import TooManyRequestsError
 import requests
-from requests.exceptions import ConnectionError, Timeout, RequestException
+from requests.exceptions import ConnectionError, Timeout, RequestException, RetryError
+from urllib3.exceptions import ResponseError as Urllib3ResponseError
+from urllib3.util.retry import Retry
 
 
 
@@ -50,22 +59,24 @@ DAYS_BACK = 90           # últimos 90 días
 # Controles suaves para evitar 429
 MAX_RETRIES          = 5     # reintentos por llamada (aumentado)
 BASE_SLEEP_SECONDS   = 30.0  # base para backoff exponencial (aumentado significativamente)
-PAUSE_BETWEEN_CALLS  = 20.0  # pausa fija entre llamadas a pytrends (aumentado)
-PAUSE_BETWEEN_CANDIDATES = 60.0  # pausa entre candidatos (aumentado a 1 minuto)
+RATE_BUCKET_CAPACITY = 5     # llamadas seguidas permitidas antes de empezar a esperar
+RATE_REFILL_SECONDS  = 30.0  # en régimen: una llamada a pytrends cada 30s
 MAX_BACKOFF_CAP      = 600.0  # máximo tiempo de espera (10 minutos)
 INITIAL_DELAY        = 30.0  # pausa inicial antes de comenzar
 BLOCKED_WAIT_TIME    = 3600.0  # tiempo de espera cuando se detecta bloqueo (1 hora)
 CONNECTION_TIMEOUT   = 60.0  # timeout para conexiones (segundos)
 REQUEST_TIMEOUT      = 120.0  # timeout para requests completos (segundos)
+HTTP_RETRIES         = 2     # reintentos a nivel HTTP (urllib3) dentro de cada llamada
+HTTP_BACKOFF_FACTOR  = 2.0   # backoff de urllib3: 2s, 4s, ... entre esos reintentos
 
 # Configuración de logging
 LOG_DIR = Path("data") / "trends" / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / f"trends_scraping_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 
-# Configurar logging
+# Configurar logging (TRENDS_VERBOSE=1 activa el nivel DEBUG)
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.DEBUG if os.environ.get("TRENDS_VERBOSE", "0") != "0" else logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(LOG_FILE, encoding='utf-8'),
@@ -90,6 +101,9 @@ CANDIDATES = {
         "Jeannette Jara", "Janet Jara", "Ministra Jara", "Jara"
     ],
 }
+CANDIDATE_COLS = tuple(CANDIDATES)  # columnas de candidatos en orden definido
+# Alias troceados en batches de 5 (límite de keywords por consulta en Trends)
+ALIAS_BATCHES = {c: [a[i:i + 5] for i in range(0, len(a), 5)] for c, a in CANDIDATES.items()}
 
 # --- Estructura de carpetas para las series de tendencias ---
 TRENDS_SERIES_DIR = Path("data") / "trends" / "series"
@@ -100,8 +114,25 @@ BACKUP_DIR = TRENDS_SERIES_DIR / "backups"
 BACKUP_DIR.mkdir(parents=True, exist_ok=True)
 PARTIAL_SAVE_FILE = TRENDS_SERIES_DIR / "trends_candidatos_partial.csv"
 
+# El Parquet es el formato principal; el CSV queda como salida secundaria porque
+# 02_descriptivos.R lo lee. Con TRENDS_EXPORT_CSV=0 se omite.
+EXPORT_CSV = os.environ.get("TRENDS_EXPORT_CSV", "1") != "0"
+
+# Si el histórico ya llega hasta ayer, main() no vuelve a descargar salvo FORCE_REFRESH=1
+FORCE_REFRESH = os.environ.get("FORCE_REFRESH", "0") != "0"
+
 
 # ----------------- Utilidades de validación -----------------
+def _parse_dates(series: pd.Series, errors: str = 'raise') -> pd.Series:
+    """
+    Convierte a datetime64 una sola vez: si la columna ya es datetime la retorna
+    tal cual; si no, parsea con cache=True (cada fecha distinta se parsea una vez).
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series, errors=errors, cache=True)
+
+
 def check_disk_space(path: Path, min_mb: float = 10.0) -> bool:
     """Verifica que haya espacio suficiente en disco."""
     try:
@@ -132,18 +163,22 @@ def validate_dataframe(df: pd.DataFrame) -> Tuple[bool, str]:
     
     # Validar que las fechas sean válidas
     try:
-        dates = pd.to_datetime(df['date'], errors='coerce')
+        dates = _parse_dates(df['date'], errors='coerce')
         if dates.isna().any():
             return False, f"Hay {dates.isna().sum()} fechas inválidas"
     except Exception as e:
         return False, f"Error validando fechas: {e}"
     
-    # Validar que los valores numéricos sean razonables (0-100 para Google Trends)
-    numeric_cols = df.select_dtypes(include=['number']).columns
-    for col in numeric_cols:
-        if col != 'date':
-            if df[col].min() < 0 or df[col].max() > 1000:  # Permitir un poco más que 100 por seguridad
-                logger.warning(f"Columna {col} tiene valores fuera del rango esperado (0-100): min={df[col].min()}, max={df[col].max()}")
+    # Validar que los valores numéricos sean razonables (0-100 para Google Trends).
+    # Chequeo global con una sola reducción NumPy; las columnas culpables solo se
+    # buscan si el chequeo rápido falla.
+    numeric = df.drop(columns=['date'], errors='ignore').select_dtypes(include=['number'])
+    if not numeric.empty:
+        arr = numeric.to_numpy(dtype='float64', na_value=float('nan'))
+        if np.nanmin(arr) < 0 or np.nanmax(arr) > 1000:  # Permitir un poco más que 100 por seguridad
+            col_mins, col_maxs = numeric.min(), numeric.max()
+            for col in numeric.columns[(col_mins < 0) | (col_maxs > 1000)]:
+                logger.warning(f"Columna {col} tiene valores fuera del rango esperado (0-100): min={col_mins[col]}, max={col_maxs[col]}")
     
     return True, "OK"
 
@@ -154,8 +189,15 @@ def backup_existing_file(file_path: Path) -> bool:
         if file_path.exists():
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_path = BACKUP_DIR / f"{file_path.stem}_{timestamp}{file_path.suffix}"
-            shutil.copy2(file_path, backup_path)
-            logger.info(f"Backup creado: {backup_path}")
+            # Hard link: el backup no copia bytes. Es seguro porque las escrituras van
+            # por _atomic_write (archivo nuevo + os.replace), que nunca modifica el inodo
+            # enlazado. Si el FS no soporta enlaces, se copia.
+            try:
+                os.link(file_path, backup_path)
+                logger.info(f"Backup creado (hard link): {backup_path}")
+            except OSError:
+                shutil.copy2(file_path, backup_path)
+                logger.info(f"Backup creado: {backup_path}")
             return True
     except Exception as e:
         logger.error(f"Error creando backup: {e}")
@@ -163,10 +205,58 @@ def backup_existing_file(file_path: Path) -> bool:
     return False
 
 
+def _atomic_write(path: Path, writer):
+    """
+    Escribe en un temporal junto a `path` y lo renombra encima (os.replace),
+    así el archivo final nunca queda a medio escribir y el inodo anterior
+    (p. ej. enlazado por un backup) no se trunca.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+# Esquema fijo del Parquet: date como date32 y cada candidato como uint8
+TRENDS_SCHEMA = pa.schema(
+    [pa.field('date', pa.date32())] + [pa.field(c, pa.uint8()) for c in CANDIDATE_COLS]
+)
+
+
+def write_trends_parquet(df: pd.DataFrame, parquet_path: Path):
+    """
+    Escribe el Parquet con TRENDS_SCHEMA (sin inferencia de tipos para date ni
+    candidatos), diccionario + zstd y estadísticas por columna. Columnas fuera del
+    esquema (p.ej. extras de un histórico antiguo) se conservan con su tipo inferido.
+    """
+    fields, arrays = [], []
+    for c in df.columns:
+        if c in TRENDS_SCHEMA.names:
+            field = TRENDS_SCHEMA.field(c)
+            if c == 'date':
+                arr = pa.array(_parse_dates(df[c]).to_numpy().astype('datetime64[D]'), type=pa.date32())
+            else:
+                arr = pa.array(df[c], type=pa.uint8(), from_pandas=True)
+        else:
+            arr = pa.Array.from_pandas(df[c])
+            field = pa.field(c, arr.type)
+            logger.warning(f"Columna '{c}' fuera del esquema de candidatos; se guarda como {arr.type}")
+        fields.append(field)
+        arrays.append(arr)
+    table = pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+    pq.write_table(table, parquet_path, compression='zstd', compression_level=3,
+                   use_dictionary=True, write_statistics=True, version='2.6')
+
+
 def safe_save_dataframe(df: pd.DataFrame, csv_path: Path, parquet_path: Path = None) -> bool:
     """
     Guarda el DataFrame de forma segura con validación y backup.
-    Si parquet_path es None, solo guarda CSV.
+    El Parquet es la salida principal (si falla, falla el guardado); el CSV es
+    secundario y se escribe solo si EXPORT_CSV. Si parquet_path es None, solo
+    guarda CSV (p. ej. progreso parcial).
     """
     try:
         # Validar datos
@@ -180,28 +270,35 @@ def safe_save_dataframe(df: pd.DataFrame, csv_path: Path, parquet_path: Path = N
             logger.error("No hay suficiente espacio en disco")
             return False
         
+        write_csv = parquet_path is None or EXPORT_CSV
+
         # Crear backup de archivos existentes
-        backup_existing_file(csv_path)
+        if write_csv:
+            backup_existing_file(csv_path)
         if parquet_path is not None:
             backup_existing_file(parquet_path)
         
-        # Guardar CSV con encoding UTF-8
-        try:
-            df.to_csv(csv_path, index=False, encoding='utf-8')
-            logger.info(f"CSV guardado: {csv_path}")
-        except Exception as e:
-            logger.error(f"Error guardando CSV: {e}")
-            return False
+        # Guardar CSV con encoding UTF-8 (secundario: se escribe antes que el Parquet
+        # para que read_history vea el Parquet como la copia más reciente)
+        if write_csv:
+            try:
+                _atomic_write(csv_path, lambda tmp: df.to_csv(tmp, index=False, encoding='utf-8',
+                                                             date_format='%Y-%m-%d'))
+                logger.info(f"CSV guardado: {csv_path}")
+            except Exception as e:
+                logger.error(f"Error guardando CSV: {e}")
+                if parquet_path is None:
+                    return False
+                logger.warning("Continuando solo con el Parquet")
         
-        # Guardar Parquet solo si se especifica
+        # Guardar Parquet (salida principal)
         if parquet_path is not None:
             try:
-                df.to_parquet(parquet_path, index=False, engine='pyarrow')
+                _atomic_write(parquet_path, lambda tmp: write_trends_parquet(df, tmp))
                 logger.info(f"Parquet guardado: {parquet_path}")
             except Exception as e:
                 logger.error(f"Error guardando Parquet: {e}")
-                # No fallar si solo falla el parquet
-                logger.warning("Continuando sin guardar Parquet")
+                return False
         
         return True
         
@@ -212,12 +309,32 @@ def safe_save_dataframe(df: pd.DataFrame, csv_path: Path, parquet_path: Path = N
 
 
 # ----------------- pytrends -----------------
+class CappedRetry(Retry):
+    """
+    Retry de urllib3 que respeta Retry-After pero con el mismo tope que el resto de
+    las esperas (MAX_BACKOFF_CAP): un Retry-After enorme no bloquea la corrida.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_BACKOFF_CAP)
+
+
+# pytrends construye su Retry en cada llamada con el nombre `Retry` de su módulo;
+# se reemplaza por la versión con tope (mismos parámetros, solo cambia Retry-After)
+pytrends.request.Retry = CappedRetry
+
+
 def make_pytrends():
     """
     Crea una instancia de pytrends con manejo de errores.
     """
     try:
-        return TrendReq(hl=HL, tz=TZ, timeout=(CONNECTION_TIMEOUT, REQUEST_TIMEOUT))
+        # retries/backoff_factor: pytrends monta un urllib3 Retry (CappedRetry) en la sesión
+        # nueva que abre en cada llamada; reintenta 429/5xx y fallos de conexión dentro de
+        # esa llamada, respetando Retry-After hasta MAX_BACKOFF_CAP
+        return TrendReq(hl=HL, tz=TZ, timeout=(CONNECTION_TIMEOUT, REQUEST_TIMEOUT),
+                        retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR)
     except Exception as e:
         logger.error(f"Error creando TrendReq: {e}")
         raise
@@ -225,26 +342,110 @@ def make_pytrends():
 
 pytrends = make_pytrends()
 
+
+class TokenBucket:
+    """
+    Limitador de tasa local (token bucket): permite ráfagas de hasta `capacity`
+    llamadas y en régimen una cada `refill_seconds`, sin pausas fijas cuando
+    todavía hay cupo. La tasa es adaptativa (AIMD): se reduce a la mitad con
+    cada 429 y se recupera de a poco con cada llamada exitosa.
+    """
+
+    def __init__(self, capacity: int, refill_seconds: float, min_fraction: float = 0.125):
+        self.capacity = capacity
+        self.base_rate = 1.0 / refill_seconds
+        self.min_rate = self.base_rate * min_fraction
+        self.refill_rate = self.base_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def acquire(self):
+        """Consume un token, esperando lo justo si no hay disponible."""
+        self._refill()
+        if self.tokens < 1:
+            wait = (1 - self.tokens) / self.refill_rate
+            print(f"  [rate] Esperando {wait:.1f}s por cupo de llamadas...")
+            time.sleep(wait)
+            self._refill()
+        self.tokens -= 1
+
+    def on_throttled(self):
+        """429 recibido: baja la tasa a la mitad (hasta min_fraction de la base) y vacía el cupo."""
+        self._refill()
+        self.refill_rate = max(self.min_rate, self.refill_rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+
+    def on_success(self):
+        """Llamada exitosa: recupera la tasa en un 10% de la base, sin pasar de ella."""
+        self._refill()
+        self.refill_rate = min(self.base_rate, self.refill_rate + self.base_rate * 0.1)
+
+
+rate_limiter = TokenBucket(RATE_BUCKET_CAPACITY, RATE_REFILL_SECONDS)
+
 # Contador global de errores 429 consecutivos
 consecutive_429_count = 0
 
 
 # ----------------- Helpers para backoff -----------------
-def backoff_sleep(attempt: int, cap: float = None):
+def retry_after_seconds(exc: Exception):
+    """
+    Segundos de espera indicados por el servidor en la cabecera Retry-After
+    de la respuesta (p.ej. un 429). Retorna None si no viene o no se puede leer.
+    Dentro de la sesión, el Retry de urllib3 ya respeta Retry-After en sus reintentos;
+    cuando estos se agotan no queda respuesta (RetryError) y aquí se retorna None,
+    con lo que rige el backoff exponencial.
+    """
+    response = getattr(exc, "response", None)
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # Retry-After también puede venir como fecha HTTP
+    try:
+        when = parsedate_to_datetime(value)
+        return max((when - datetime.now(when.tzinfo)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_sleep(attempt: int, cap: float = None, retry_after: float = None):
     """
     Pausa con backoff exponencial + jitter.
     attempt = 0,1,2,...
+    Si el servidor indicó Retry-After, se espera exactamente eso (con el mismo tope).
     """
     if cap is None:
         cap = MAX_BACKOFF_CAP
-    delay = min(BASE_SLEEP_SECONDS * (2 ** attempt) + random.uniform(0, 10.0), cap)
-    print(f"  [backoff] Sleeping {delay:.1f}s (attempt {attempt+1})...")
+    if retry_after is not None:
+        delay = min(retry_after, cap)
+        print(f"  [backoff] Retry-After del servidor: {delay:.1f}s (attempt {attempt+1})...")
+    else:
+        delay = min(BASE_SLEEP_SECONDS * (2 ** attempt) + random.uniform(0, 10.0), cap)
+        print(f"  [backoff] Sleeping {delay:.1f}s (attempt {attempt+1})...")
     time.sleep(delay)
 
 
+def _handle_sigterm(signum, frame):
+    """
+    SIGTERM se trata como Ctrl+C: interrumpe cualquier espera (incluida la larga por
+    bloqueo) y main() guarda el progreso parcial.
+    """
+    raise KeyboardInterrupt(f"Señal {signum} recibida")
+
+
 def wait_if_blocked(consecutive_429s: int = 0):
     """
     Si hay muchos 429 consecutivos, espera un tiempo largo.
+    Ctrl+C o SIGTERM la interrumpen (KeyboardInterrupt).
     """
     if consecutive_429s >= 3:
         wait_minutes = BLOCKED_WAIT_TIME / 60
@@ -264,36 +465,59 @@ def wait_if_blocked(consecutive_429s: int = 0):
         print(f"  ✓ Espera completada. Reintentando...\n")
 
 
-def safe_build_payload(kw_list, timeframe, cat=0, geo="CL", gprop=""):
+# Motivo con que urllib3 agota sus reintentos cuando la última respuesta fue un 429
+RETRY_REASON_429 = Urllib3ResponseError.SPECIFIC_ERROR.format(status_code=429)
+
+
+def _is_429_retry_error(exc: RetryError) -> bool:
     """
-    Wrapper con reintentos alrededor de build_payload.
-    Maneja errores de conexión, timeout y rate limiting.
+    True si urllib3 agotó sus reintentos por respuestas 429. Se mira el motivo del
+    MaxRetryError envuelto (no el mensaje completo, que incluye la URL y su query).
+    """
+    max_retry = exc.args[0] if exc.args else None
+    reason = getattr(max_retry, "reason", None)
+    return isinstance(reason, Urllib3ResponseError) and str(reason) == RETRY_REASON_429
+
+
+def _run_accion(accion):
+    """
+    Ejecuta accion(pytrends) separando los RetryError de urllib3: si sus reintentos se
+    agotaron sobre respuestas 429 es rate limiting (se relanza como TooManyRequestsError);
+    si fue por 5xx se deja pasar como error de red/servidor, sin contar como bloqueo.
+    """
+    try:
+        return accion(pytrends)
+    except RetryError as e:
+        if _is_429_retry_error(e):
+            raise TooManyRequestsError(str(e), getattr(e, "response", None)) from e
+        raise
+
+
+def call_with_retries(nombre: str, accion):
+    """
+    Ejecuta accion(pytrends) con reintentos ante rate limiting (429), errores de
+    conexión/timeout y otros errores, con backoff y detección de bloqueo.
+    Si se agotan los reintentos, relanza la última excepción.
     """
     global pytrends, consecutive_429_count
     
     for i in range(MAX_RETRIES):
         try:
-            # Recrear pytrends si es necesario (puede ayudar con rate limits)
-            if i > 0:
-                logger.info(f"Recreando TrendReq (intento {i+1})")
-                pytrends = make_pytrends()
-                time.sleep(10)  # Pausa adicional al recrear
-            
-            pytrends.build_payload(
-                kw_list=kw_list,
-                cat=cat,
-                timeframe=timeframe,
-                geo=geo,
-                gprop=gprop,
-            )
+            # Se reutiliza la misma instancia (y su cookie NID) entre reintentos: recrear
+            # TrendReq cuesta un GET extra a google.com por vez. Solo el último intento
+            # tras la espera por bloqueo crea una instancia nueva.
+            rate_limiter.acquire()
+            result = _run_accion(accion)
             # Si llegamos aquí, la solicitud fue exitosa
             consecutive_429_count = 0
-            time.sleep(PAUSE_BETWEEN_CALLS)
-            return
+            rate_limiter.on_success()
+            return result
         except TooManyRequestsError as e:
+            # 429 directo de pytrends, o reintentos de urllib3 agotados sobre 429 (_run_accion)
             consecutive_429_count += 1
-            logger.warning(f"TooManyRequestsError en build_payload() (intento {i+1}/{MAX_RETRIES})")
-            print(f"  TooManyRequestsError en build_payload() (intento {i+1}/{MAX_RETRIES})")
+            rate_limiter.on_throttled()
+            logger.warning(f"TooManyRequestsError en {nombre}() (intento {i+1}/{MAX_RETRIES})")
+            print(f"  TooManyRequestsError en {nombre}() (intento {i+1}/{MAX_RETRIES})")
             
             # Si hay muchos 429 consecutivos, esperar mucho tiempo
             if consecutive_429_count >= 3:
@@ -301,8 +525,8 @@ def safe_build_payload(kw_list, timeframe, cat=0, geo="CL", gprop=""):
                 consecutive_429_count = 0  # Reset después de esperar
             
             if i == MAX_RETRIES - 1:
-                logger.error("Máximo de reintentos alcanzado en build_payload")
-                print("  Máximo de reintentos alcanzado en build_payload.")
+                logger.error(f"Máximo de reintentos alcanzado en {nombre}")
+                print(f"  Máximo de reintentos alcanzado en {nombre}.")
                 # En lugar de abortar inmediatamente, esperar y reintentar una vez más
                 if consecutive_429_count < 3:
                     print("  Esperando tiempo adicional antes de fallar definitivamente...")
@@ -311,27 +535,22 @@ def safe_build_payload(kw_list, timeframe, cat=0, geo="CL", gprop=""):
                     try:
                         pytrends = make_pytrends()
                         time.sleep(10)
-                        pytrends.build_payload(
-                            kw_list=kw_list,
-                            cat=cat,
-                            timeframe=timeframe,
-                            geo=geo,
-                            gprop=gprop,
-                        )
+                        rate_limiter.acquire()
+                        result = _run_accion(accion)
                         consecutive_429_count = 0
-                        time.sleep(PAUSE_BETWEEN_CALLS)
-                        return
+                        rate_limiter.on_success()
+                        return result
                     except Exception as e:
                         logger.error(f"Último intento falló: {e}")
                         print(f"  Último intento falló: {e}")
                         raise
                 raise
-            backoff_sleep(i)
+            backoff_sleep(i, retry_after=retry_after_seconds(e))
         except (ConnectionError, Timeout, RequestException) as e:
             # Errores de conexión/red
             consecutive_429_count = 0
-            logger.warning(f"Error de conexión/red en build_payload(): {e} (intento {i+1}/{MAX_RETRIES})")
-            print(f"  Error de conexión en build_payload(): {e} (intento {i+1}/{MAX_RETRIES})")
+            logger.warning(f"Error de conexión/red en {nombre}(): {e} (intento {i+1}/{MAX_RETRIES})")
+            print(f"  Error de conexión en {nombre}(): {e} (intento {i+1}/{MAX_RETRIES})")
             if i == MAX_RETRIES - 1:
                 logger.error("Máximo de reintentos alcanzado por error de conexión")
                 raise
@@ -341,138 +560,162 @@ def safe_build_payload(kw_list, timeframe, cat=0, geo="CL", gprop=""):
         except Exception as e:
             # Reset contador si es otro tipo de error
             consecutive_429_count = 0
-            logger.warning(f"Error en build_payload(): {e} (intento {i+1}/{MAX_RETRIES})")
-            print(f"  Error en build_payload(): {e} (intento {i+1}/{MAX_RETRIES})")
+            logger.warning(f"Error en {nombre}(): {e} (intento {i+1}/{MAX_RETRIES})")
+            print(f"  Error en {nombre}(): {e} (intento {i+1}/{MAX_RETRIES})")
             if i == MAX_RETRIES - 1:
-                logger.error(f"Error no recuperable en build_payload: {e}")
+                logger.error(f"Error no recuperable en {nombre}: {e}")
                 raise
             backoff_sleep(i)
 
 
+def safe_build_payload(kw_list, timeframe, cat=0, geo="CL", gprop=""):
+    """
+    Wrapper con reintentos alrededor de build_payload.
+    Relanza la excepción si se agotan los reintentos.
+    """
+    call_with_retries("build_payload", lambda tr: tr.build_payload(
+        kw_list=kw_list,
+        cat=cat,
+        timeframe=timeframe,
+        geo=geo,
+        gprop=gprop,
+    ))
+
+
+def _normalize_pytrends_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deja un DataFrame de pytrends con las fechas como columna 'date' y sin 'isPartial'.
+    Es idempotente: si ya viene normalizado lo retorna sin cambios.
+    """
+    # pytrends retorna el DataFrame con fechas como índice (DatetimeIndex), no como columna
+    # Resetear índice para convertir las fechas en una columna llamada 'date'
+    if isinstance(df.index, pd.DatetimeIndex):
+        df = df.reset_index()
+        # El índice reseteado generalmente se convierte en la primera columna
+        # Renombrar la primera columna a 'date' si no se llama así ya
+        if len(df.columns) > 0 and df.columns[0] != 'date':
+            # Verificar si la primera columna es de tipo fecha
+            if pd.api.types.is_datetime64_any_dtype(df[df.columns[0]]):
+                df = df.rename(columns={df.columns[0]: 'date'})
+            else:
+                # Si no es fecha, puede que el índice no se haya reseteado correctamente
+                logger.warning(f"Primera columna después de reset_index no es fecha: {df.columns[0]}")
+    
+    # Eliminar columna 'isPartial' (pytrends siempre la nombra así)
+    return df.drop(columns='isPartial', errors='ignore')
+
+
+def _interest_over_time(tr) -> pd.DataFrame:
+    """
+    interest_over_time() con fechas como columna 'date' y sin 'isPartial'.
+    Lanza ValueError si pytrends no retorna datos (cuenta como intento fallido).
+    """
+    df = tr.interest_over_time()
+    if df is None:
+        raise ValueError("interest_over_time() retornó None")
+    return _normalize_pytrends_df(df)
+
+
 def safe_interest_over_time():
     """
     Wrapper con reintentos alrededor de interest_over_time.
-    Maneja errores de conexión, timeout y rate limiting.
-    Retorna DataFrame con columna 'date' (resetea índice si viene como índice).
+    Retorna DataFrame con columna 'date' (resetea índice si viene como índice),
+    o un DataFrame vacío si se agotan los reintentos.
     """
-    global pytrends, consecutive_429_count
-    
-    for i in range(MAX_RETRIES):
-        try:
-            df = pytrends.interest_over_time()
-            
-            # Validar que el DataFrame tenga datos
-            if df is None:
-                logger.warning("interest_over_time() retornó None")
-                if i == MAX_RETRIES - 1:
-                    return pd.DataFrame()  # Retornar DataFrame vacío en lugar de fallar
-                backoff_sleep(i)
-                continue
-            
-            # pytrends retorna el DataFrame con fechas como índice (DatetimeIndex), no como columna
-            # Resetear índice para convertir las fechas en una columna llamada 'date'
-            if isinstance(df.index, pd.DatetimeIndex):
-                df = df.reset_index()
-                # El índice reseteado generalmente se convierte en la primera columna
-                # Renombrar la primera columna a 'date' si no se llama así ya
-                if len(df.columns) > 0 and df.columns[0] != 'date':
-                    # Verificar si la primera columna es de tipo fecha
-                    if pd.api.types.is_datetime64_any_dtype(df[df.columns[0]]):
-                        df = df.rename(columns={df.columns[0]: 'date'})
-                    else:
-                        # Si no es fecha, puede que el índice no se haya reseteado correctamente
-                        # Intentar crear columna 'date' desde el índice original
-                        logger.warning(f"Primera columna después de reset_index no es fecha: {df.columns[0]}")
-            
-            # Eliminar columna 'isPartial' si existe (pytrends la incluye)
-            if 'isPartial' in df.columns:
-                df = df.drop(columns=['isPartial'])
-            if 'isPartial' in df.index.names:
-                df = df.reset_index(drop=True)
-            
-            # Si llegamos aquí, la solicitud fue exitosa
-            consecutive_429_count = 0
-            time.sleep(PAUSE_BETWEEN_CALLS)
-            return df
-        except TooManyRequestsError as e:
-            consecutive_429_count += 1
-            logger.warning(f"TooManyRequestsError en interest_over_time() (intento {i+1}/{MAX_RETRIES})")
-            print(f"  TooManyRequestsError en interest_over_time() (intento {i+1}/{MAX_RETRIES})")
-            
-            # Si hay muchos 429 consecutivos, esperar mucho tiempo
-            if consecutive_429_count >= 3:
-                wait_if_blocked(consecutive_429_count)
-                consecutive_429_count = 0  # Reset después de esperar
-            
-            if i == MAX_RETRIES - 1:
-                logger.error("Máximo de reintentos alcanzado en interest_over_time")
-                print("  Máximo de reintentos alcanzado en interest_over_time.")
-                # En lugar de abortar inmediatamente, esperar y reintentar una vez más
-                if consecutive_429_count < 3:
-                    print("  Esperando tiempo adicional antes de fallar definitivamente...")
-                    wait_if_blocked(consecutive_429_count)
-                    # Último intento
-                    try:
-                        pytrends = make_pytrends()
-                        time.sleep(10)
-                        df = pytrends.interest_over_time()
-                        # Resetear índice si es necesario (pytrends usa índice de fecha)
-                        if df is not None and isinstance(df.index, pd.DatetimeIndex):
-                            df = df.reset_index()
-                            if len(df.columns) > 0 and df.columns[0] != 'date':
-                                if pd.api.types.is_datetime64_any_dtype(df[df.columns[0]]):
-                                    df = df.rename(columns={df.columns[0]: 'date'})
-                        if df is not None and 'isPartial' in df.columns:
-                            df = df.drop(columns=['isPartial'])
-                        consecutive_429_count = 0
-                        time.sleep(PAUSE_BETWEEN_CALLS)
-                        return df if df is not None else pd.DataFrame()
-                    except Exception as e:
-                        logger.error(f"Último intento falló: {e}")
-                        print(f"  Último intento falló: {e}")
-                        # Retornar DataFrame vacío en lugar de fallar
-                        return pd.DataFrame()
-                # Retornar DataFrame vacío en lugar de fallar
-                return pd.DataFrame()
-            backoff_sleep(i)
-        except (ConnectionError, Timeout, RequestException) as e:
-            # Errores de conexión/red
-            consecutive_429_count = 0
-            logger.warning(f"Error de conexión/red en interest_over_time(): {e} (intento {i+1}/{MAX_RETRIES})")
-            print(f"  Error de conexión en interest_over_time(): {e} (intento {i+1}/{MAX_RETRIES})")
-            if i == MAX_RETRIES - 1:
-                logger.error("Máximo de reintentos alcanzado por error de conexión")
-                # Retornar DataFrame vacío en lugar de fallar
-                return pd.DataFrame()
-            # Esperar más tiempo para errores de conexión
-            time.sleep(BASE_SLEEP_SECONDS * 2)
-            backoff_sleep(i)
-        except Exception as e:
-            # Reset contador si es otro tipo de error
-            consecutive_429_count = 0
-            logger.warning(f"Error en interest_over_time(): {e} (intento {i+1}/{MAX_RETRIES})")
-            print(f"  Error en interest_over_time(): {e} (intento {i+1}/{MAX_RETRIES})")
-            if i == MAX_RETRIES - 1:
-                logger.error(f"Error no recuperable en interest_over_time: {e}")
-                # Retornar DataFrame vacío en lugar de fallar
-                return pd.DataFrame()
-            backoff_sleep(i)
-    
-    # Si llegamos aquí, retornar DataFrame vacío
-    return pd.DataFrame()
+    try:
+        return call_with_retries("interest_over_time", _interest_over_time)
+    except Exception:
+        # Retornar DataFrame vacío en lugar de fallar
+        return pd.DataFrame()
 
 
 # ----------------- Utilidades -----------------
-def ensure_all_candidate_cols(df: pd.DataFrame) -> pd.DataFrame:
+def to_trends_dtype(df: pd.DataFrame, cols) -> pd.DataFrame:
     """
-    Asegura que el DF tenga todas las columnas de candidatos.
+    Baja las columnas de candidatos a enteros de 1 byte: Trends entrega valores
+    enteros en [0, 100]. Usa uint8 si no hay faltantes y UInt8 (nullable) si los hay.
     """
-    for c in CANDIDATES.keys():
-        if c not in df.columns:
-            df[c] = pd.NA
+    cols = list(cols)
+    if not cols:
+        return df
+    vals = df[cols].apply(pd.to_numeric, errors='coerce').clip(0, 255).round()
+    df[cols] = vals.astype('UInt8' if vals.isna().any().any() else 'uint8')
     return df
 
 
+def ensure_all_candidate_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Asegura que el DF tenga todas las columnas de candidatos (las faltantes
+    quedan en NaN), con un solo reindex en vez de asignar columna por columna.
+    """
+    return df.reindex(columns=df.columns.union(CANDIDATE_COLS, sort=False))
+
+
+def read_history() -> pd.DataFrame:
+    """
+    Lee el histórico diario: desde el Parquet (columnar, ya tipado) si está al día
+    con el CSV; si no, desde el CSV probando distintos encodings.
+    Retorna None si no se pudo leer.
+    """
+    parquet_al_dia = OUT_PARQUET_DAILY.exists() and (
+        not OUT_CSV_DAILY.exists()
+        or OUT_PARQUET_DAILY.stat().st_mtime >= OUT_CSV_DAILY.stat().st_mtime
+    )
+    if parquet_al_dia:
+        try:
+            # date32 -> datetime64 directo (sin pasar por objetos datetime.date de Python)
+            hist = pq.read_table(OUT_PARQUET_DAILY).to_pandas(date_as_object=False)
+            logger.info(f"Histórico leído desde Parquet: {OUT_PARQUET_DAILY}")
+            return hist
+        except Exception as e:
+            logger.warning(f"Error leyendo Parquet histórico, se usa el CSV: {e}")
+
+    if not OUT_CSV_DAILY.exists():
+        return None
+
+    # Lector CSV multihilo de pyarrow, solo con las columnas y tipos esperados
+    try:
+        header = pd.read_csv(OUT_CSV_DAILY, nrows=0, encoding='utf-8').columns
+        usecols = ['date'] + [c for c in CANDIDATE_COLS if c in header]
+        hist = pd.read_csv(OUT_CSV_DAILY, engine='pyarrow', usecols=usecols,
+                           dtype={c: 'float32' for c in usecols[1:]}, parse_dates=['date'])
+        logger.info("Histórico leído con el lector CSV de pyarrow")
+        return hist
+    except Exception as e:
+        logger.warning(f"Error leyendo CSV con pyarrow, probando encodings: {e}")
+
+    # Alternativa: intentar leer con diferentes encodings, con la misma proyección
+    # (date + candidatos) que el lector de pyarrow
+    for encoding in ['utf-8', 'latin-1', 'iso-8859-1']:
+        try:
+            hist = pd.read_csv(OUT_CSV_DAILY, parse_dates=["date"], encoding=encoding,
+                               usecols=lambda c: c == 'date' or c in CANDIDATE_COLS)
+            logger.info(f"Histórico leído con encoding: {encoding}")
+            return hist
+        except (UnicodeDecodeError, pd.errors.EmptyDataError) as e:
+            logger.warning(f"Error leyendo con encoding {encoding}: {e}")
+            continue
+    return None
+
+
+def history_max_date():
+    """
+    Última fecha del histórico, leyendo solo la columna 'date' del Parquet.
+    Retorna None si no hay Parquet o no se puede leer.
+    """
+    if not OUT_PARQUET_DAILY.exists():
+        return None
+    try:
+        tbl = pq.read_table(OUT_PARQUET_DAILY, columns=['date'])
+        max_date = pc.max(tbl.column('date')).as_py()
+    except Exception as e:
+        logger.warning(f"No se pudo leer la última fecha del histórico: {e}")
+        return None
+    if isinstance(max_date, datetime):
+        max_date = max_date.date()
+    return max_date
+
+
 # ----------------- Descarga últimos 90 días -----------------
 def fetch_last_90_days() -> pd.DataFrame:
     """
@@ -493,14 +736,9 @@ def fetch_last_90_days() -> pd.DataFrame:
     for idx, (cname, aliases) in enumerate(candidate_list, 1):
         print(f"\n[{idx}/{len(candidate_list)}] → Candidato: {cname}")
         
-        # Pausa entre candidatos (excepto el primero)
-        if idx > 1:
-            print(f"  Esperando {PAUSE_BETWEEN_CANDIDATES}s antes de procesar siguiente candidato...")
-            time.sleep(PAUSE_BETWEEN_CANDIDATES)
-        
         try:
-            # Si hay más de 5 alias, trocear en batches de 5 (límite Trends)
-            alias_batches = [aliases[i:i + 5] for i in range(0, len(aliases), 5)]
+            # Batches de alias precalculados a nivel de módulo (máx. 5 por consulta)
+            alias_batches = ALIAS_BATCHES[cname]
 
             alias_series = []
             for batch_idx, batch in enumerate(alias_batches, 1):
@@ -526,17 +764,7 @@ def fetch_last_90_days() -> pd.DataFrame:
                         print(f"     ⚠ Datos inválidos: {error_msg}")
                         continue
 
-                    # Asegurar que 'date' está como columna (pytrends la retorna como índice)
-                    if isinstance(df.index, pd.DatetimeIndex):
-                        df = df.reset_index()
-                        if len(df.columns) > 0 and df.columns[0] != 'date':
-                            if pd.api.types.is_datetime64_any_dtype(df[df.columns[0]]):
-                                df = df.rename(columns={df.columns[0]: 'date'})
-                    
-                    # Quitar columna isPartial si viene
-                    df = df.drop(columns=[c for c in df.columns if c.lower() == "ispartial"],
-                                 errors="ignore")
-                    alias_series.append(df)
+                    alias_series.append(_normalize_pytrends_df(df))
                     print(f"     ✓ Datos obtenidos: {len(df)} días")
                     logger.info(f"Datos obtenidos para batch {batch}: {len(df)} días")
                 except Exception as e:
@@ -549,42 +777,27 @@ def fetch_last_90_days() -> pd.DataFrame:
                 print(f"   ⚠ No se obtuvieron datos para {cname}")
                 continue
 
-            # Asegurar que todos los DataFrames tengan 'date' como columna y como índice para merge
-            for i, df_alias in enumerate(alias_series):
-                if 'date' not in df_alias.columns:
-                    if isinstance(df_alias.index, pd.DatetimeIndex):
-                        df_alias = df_alias.reset_index()
-                        if len(df_alias.columns) > 0:
-                            first_col = df_alias.columns[0]
-                            if pd.api.types.is_datetime64_any_dtype(df_alias[first_col]):
-                                df_alias = df_alias.rename(columns={first_col: 'date'})
-                            else:
-                                # Crear columna date desde el índice si todavía no existe
-                                df_alias['date'] = df_alias.index
-                    alias_series[i] = df_alias
-            
-            # Combinar alias usando 'date' como clave de unión
-            merged = alias_series[0].copy()
-            for df_alias in alias_series[1:]:
-                # Hacer merge por fecha
-                merged = pd.merge(merged, df_alias, on='date', how='outer', suffixes=('', '_new'))
+            # Combinar alias: alinear los batches a un índice común de fechas y tomar el
+            # máximo con una sola reducción NumPy sobre (n_alias, n_días)
+            batches = [df_alias.set_index('date') for df_alias in alias_series]
+            idx = batches[0].index.append([b.index for b in batches[1:]]).unique().sort_values()
+            arrs = [
+                b[c].reindex(idx, fill_value=0).to_numpy(dtype='float64', na_value=0.0)
+                for b in batches
+                for c in b.columns
+                if pd.api.types.is_numeric_dtype(b[c])
+            ]
             
-            # Convertir fechas a formato date si no lo están
-            if 'date' in merged.columns:
-                merged['date'] = pd.to_datetime(merged['date']).dt.date
-            
-            # Seleccionar solo columnas numéricas (excluyendo 'date' e 'isPartial')
-            numeric_cols = [c for c in merged.columns if c != 'date' and c.lower() != 'ispartial' and pd.api.types.is_numeric_dtype(merged[c])]
-            
-            if not numeric_cols:
+            if not arrs:
                 logger.warning(f"No hay columnas numéricas para combinar en {cname}")
                 continue
             
-            # Crear columna única por candidato: máximo diario entre alias
-            merged[cname] = merged[numeric_cols].max(axis=1)
+            # Serie única por candidato: máximo diario entre alias (entre columnas y entre batches)
+            vals = np.maximum.reduce(np.vstack(arrs), axis=0)
 
             # Guardar solo la serie del candidato con fecha
-            result_df = merged[['date', cname]].copy()
+            result_df = pd.DataFrame({'date': idx, cname: vals})
+            result_df['date'] = _parse_dates(result_df['date'])
             frames.append(result_df)
             print(f"   ✓ {cname} completado exitosamente")
             
@@ -597,27 +810,18 @@ def fetch_last_90_days() -> pd.DataFrame:
         print("\n⚠ No se obtuvieron datos para ningún candidato.")
         return pd.DataFrame()
 
-    # Combinar todos los frames por fecha usando merge
-    out = frames[0].copy()
-    for df_frame in frames[1:]:
-        out = pd.merge(out, df_frame, on='date', how='outer', suffixes=('', '_new'))
-    
-    # Asegurar formato de fecha
-    out["date"] = pd.to_datetime(out["date"]).dt.date
-    
-    # Ordenar por fecha
-    out = out.sort_values("date").reset_index(drop=True)
-    
-    # Rellenar valores faltantes con 0 para columnas numéricas
-    numeric_cols = out.select_dtypes(include=['number']).columns
-    out[numeric_cols] = out[numeric_cols].fillna(0)
-    
-    # Ordenar columnas: date + candidatos en orden definido
-    cols = ["date"] + list(CANDIDATES.keys())
-    # Mantener solo columnas que existen
-    available_cols = [c for c in cols if c in out.columns]
-    extra_cols = [c for c in out.columns if c not in cols]
-    out = out.reindex(columns=available_cols + extra_cols)
+    # Combinar todos los candidatos en un buffer NumPy preasignado (días × candidatos):
+    # una sola asignación, sin alinear columna por columna ni fillna posterior.
+    # Las fechas sin dato quedan en 0. Los frames llegan en el orden de CANDIDATES.
+    all_days = pd.DatetimeIndex(np.unique(np.concatenate([f['date'].to_numpy() for f in frames])),
+                                name='date')
+    names = [f.columns[1] for f in frames]
+    arr = np.zeros((len(all_days), len(frames)), dtype=np.uint8)
+    for j, f in enumerate(frames):
+        pos = all_days.searchsorted(f['date'].to_numpy())
+        arr[pos, j] = np.clip(np.rint(f[names[j]].to_numpy(dtype='float64', na_value=0.0)), 0, 255)
+    out = pd.DataFrame(arr, columns=names)
+    out.insert(0, 'date', all_days)
 
     return out
 
@@ -630,6 +834,14 @@ def main():
         # Reset contador de 429
         consecutive_429_count = 0
         
+        # 0) Si el histórico ya está al día (re-ejecución el mismo día), no descargar
+        last_date = history_max_date()
+        if last_date is not None and last_date >= date.today() - timedelta(days=1) and not FORCE_REFRESH:
+            print(f"✓ Histórico al día (última fecha: {last_date}). Nada que descargar.")
+            print("  Usa FORCE_REFRESH=1 para forzar la descarga.")
+            logger.info(f"Histórico al día (última fecha: {last_date}); se omite la descarga")
+            return
+        
         # 1) Descarga últimos 90 días
         print("=" * 60)
         print("INICIANDO DESCARGA DE GOOGLE TRENDS")
@@ -651,28 +863,18 @@ def main():
         print(f"  Candidatos con datos: {sum(1 for col in df90.columns if col != 'date' and df90[col].sum() > 0)}/{len(CANDIDATES)}")
 
         # 2) Si existe el histórico, unir y sobrescribir fechas solapadas
-        if OUT_CSV_DAILY.exists():
-            print(f"\n📂 Leyendo histórico: {OUT_CSV_DAILY}")
+        if OUT_CSV_DAILY.exists() or OUT_PARQUET_DAILY.exists():
+            print(f"\n📂 Leyendo histórico: {TRENDS_SERIES_DIR}")
             try:
-                # Intentar leer con diferentes encodings
-                hist = None
-                for encoding in ['utf-8', 'latin-1', 'iso-8859-1']:
-                    try:
-                        hist = pd.read_csv(OUT_CSV_DAILY, parse_dates=["date"], encoding=encoding)
-                        logger.info(f"Histórico leído con encoding: {encoding}")
-                        break
-                    except (UnicodeDecodeError, pd.errors.EmptyDataError) as e:
-                        logger.warning(f"Error leyendo con encoding {encoding}: {e}")
-                        continue
+                hist = read_history()
                 
                 if hist is None or hist.empty:
                     raise ValueError("No se pudo leer el histórico o está vacío")
                 
                 # Validar fechas
                 try:
-                    hist["date"] = pd.to_datetime(hist["date"], errors='coerce')
+                    hist["date"] = _parse_dates(hist["date"], errors='coerce')
                     hist = hist.dropna(subset=['date'])  # Eliminar filas con fechas inválidas
-                    hist["date"] = hist["date"].dt.date
                 except Exception as e:
                     logger.error(f"Error procesando fechas del histórico: {e}")
                     raise
@@ -680,9 +882,19 @@ def main():
                 hist = ensure_all_candidate_cols(hist)
                 df90 = ensure_all_candidate_cols(df90)
 
-                combo = pd.concat([hist, df90], ignore_index=True)
-                # Ordenar y eliminar duplicados por fecha (dejando el último = datos nuevos)
-                combo = combo.sort_values("date").drop_duplicates(subset=["date"], keep="last")
+                # El histórico se guarda ordenado y sin fechas repetidas; solo se corrige
+                # si viene de un archivo antiguo
+                if not (hist["date"].is_monotonic_increasing and hist["date"].is_unique):
+                    hist = hist.sort_values("date").drop_duplicates(subset=["date"], keep="last")
+                # Actualización alineada por fecha: las fechas solapadas toman los datos nuevos
+                # y las nuevas se agregan al final (la unión de índices ordenados no reordena
+                # todo el histórico). update() ignora los NA de df90, así un candidato que
+                # falló en esta corrida conserva sus valores históricos.
+                hist_i = hist.set_index("date")
+                new_i = df90.set_index("date")
+                combo = hist_i.reindex(hist_i.index.union(new_i.index))
+                combo.update(new_i)
+                combo = combo.rename_axis("date").reset_index()
                 print(f"  ✓ Histórico cargado: {len(hist)} días previos")
                 logger.info(f"Histórico cargado: {len(hist)} días previos")
             except Exception as e:
@@ -696,9 +908,10 @@ def main():
             combo = ensure_all_candidate_cols(df90)
 
         # 3) Reordenar columnas: date + candidatos + cualquier extra
-        cols = ["date"] + list(CANDIDATES.keys())
+        cols = ["date", *CANDIDATE_COLS]
         extra = [c for c in combo.columns if c not in cols]
         combo = combo.reindex(columns=cols + extra)
+        combo = to_trends_dtype(combo, CANDIDATE_COLS)
 
         # 4) Guardar con validación
         print(f"\n💾 Guardando datos...")
@@ -720,11 +933,11 @@ def main():
         print("=" * 60)
         print(f"📄 CSV diario: {OUT_CSV_DAILY}")
         print(f"📄 Parquet diario: {OUT_PARQUET_DAILY}")
-        print(f"📅 Rango: {combo['date'].min()} → {combo['date'].max()} (n={len(combo)} días)")
+        print(f"📅 Rango: {combo['date'].min():%Y-%m-%d} → {combo['date'].max():%Y-%m-%d} (n={len(combo)} días)")
         print("=" * 60 + "\n")
-        print("Últimas 5 filas:")
-        print(combo.tail())
-        print()
+        # La vista previa solo se formatea en modo detallado
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Últimas 5 filas:\n" + combo.tail().to_string())
         
     except KeyboardInterrupt:
         logger.warning("Interrupción del usuario (Ctrl+C)")
@@ -758,4 +971,5 @@ def main():
 
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     main()
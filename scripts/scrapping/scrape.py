@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+# /usr/bin/env python
+"""Scraper de Reddit compartido por 01_scrapping_reddit.py y 02_scrapping_derecha.py.
+
+Cada script solo define su configuración (subreddits, sufijo, límite y filtro de nombres)
+y llama a run(). Varias configuraciones en un mismo proceso comparten las sesiones PRAW,
+la caché HTTP y los filtros ya compilados.
+"""
+import os
+import re
+import time
+import queue
+import hashlib
+import unicodedata
+from datetime import datetime
+from dateutil import tz
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+import praw
+from prawcore.exceptions import RequestException, ResponseException, ServerError, Forbidden, NotFound
+
+# ============== ⚙️ Configuración Excel (fallback si no hay openpyxl) ==============
+try:
+    import openpyxl   # noqa
+    WRITER_ENGINE = "openpyxl"
+except ImportError:
+    try:
+        import xlsxwriter  # noqa
+        WRITER_ENGINE = "xlsxwriter"
+    except ImportError:
+        WRITER_ENGINE = None
+
+# ============== 🔎 Búsqueda multi-patrón (opcional) ==============
+try:
+    import ahocorasick_rs  # autómata Aho-Corasick: todas las palabras clave en una sola pasada
+except ImportError:
+    ahocorasick_rs = None
+
+try:
+    import re2 as RE_ENGINE  # google-re2 (DFA): sin backtracking, inmune a ReDoS
+except ImportError:
+    RE_ENGINE = re
+
+try:
+    import pyarrow as pa  # kernels de texto de Arrow (C++/RE2) para el filtro vectorizado
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# ============== 🗄️ Caché HTTP (opcional) ==============
+try:
+    from requests_cache import CachedSession
+except ImportError:
+    CachedSession = None
+
+# ============== 📂 Salidas ==============
+downloads_folder = "data/raw"
+Path(downloads_folder).mkdir(parents=True, exist_ok=True)
+
+# ============== ⏱️ Parámetros ==============
+saltar_stickies = True
+max_retries = 4
+base_backoff = 1.5
+# Caché HTTP en disco (requiere requests-cache), una sola para todas las configuraciones:
+# re-ejecuciones cercanas no repiten descargas
+http_cache_path = os.path.join(downloads_folder, "reddit_http_cache")
+http_cache_ttl = 900  # segundos
+# Subreddits recorridos a la vez. Cada hilo usa su propia sesión PRAW, pero todas comparten
+# las credenciales de la app y el cupo de Reddit por cliente (~100 requests/min): más hilos
+# no suben ese techo, solo lo alcanzan antes. Mantenerlo bajo.
+max_subreddit_workers = 2
+
+# ============== 🔑 Credenciales Reddit ==============
+# Sesiones PRAW libres para reutilizar entre corridas del mismo proceso. praw.Reddit no es
+# thread-safe: cada hilo toma una sesión del pool (o crea una) y la devuelve al terminar
+REDDIT_POOL = queue.SimpleQueue()
+
+def make_reddit():
+    requestor_kwargs = {}
+    if CachedSession is not None:
+        # GETs (listados /new, árboles de comentarios) se sirven desde disco durante http_cache_ttl
+        requestor_kwargs["session"] = CachedSession(
+            http_cache_path, expire_after=http_cache_ttl, allowable_methods=("GET",)
+        )
+    return praw.Reddit(
+        client_id= "",
+        client_secret = "",
+        user_agent = "",
+        requestor_kwargs=requestor_kwargs, )
+
+def acquire_reddit():
+    try:
+        return REDDIT_POOL.get_nowait()
+    except queue.Empty:
+        return make_reddit()
+
+# ============== 🔎 Filtro por nombres (robusto a acentos) ==============
+# Filtros compilados, por (patrones, palabras clave): se compilan una vez por proceso
+COMPILED_FILTERS = {}
+
+COMBINING_RE = re.compile(r"[\u0300-\u036f]")  # acentos y diacríticos tras NFKD
+COMBINING_RE2 = r"[\x{0300}-\x{036f}]"          # el mismo rango en sintaxis RE2 (kernels de Arrow)
+
+def compile_filter(patterns, keywords=None):
+    """Regex unida + prefiltro de palabras clave.
+
+    Los patrones se aplican sobre texto normalizado (minúsculas, sin acentos) y todo match
+    debe contener alguna de las palabras clave: si ninguna aparece, no se corre la regex.
+    Sin palabras clave no hay prefiltro y solo decide la regex.
+    """
+    key = (tuple(patterns), tuple(keywords or ()))
+    if key not in COMPILED_FILTERS:
+        pattern = "|".join(patterns)
+        keywords = list(key[1])
+        COMPILED_FILTERS[key] = {
+            "pattern": pattern,
+            # Con re se fuerza ASCII: \b y \s quedan con la misma semántica que en RE2
+            "regex": RE_ENGINE.compile(pattern, re.ASCII) if RE_ENGINE is re else RE_ENGINE.compile(pattern),
+            "keywords": keywords,
+            "keywords_pattern": "|".join(re.escape(k) for k in keywords),
+            "ac": ahocorasick_rs.AhoCorasick(keywords) if ahocorasick_rs and keywords else None,
+        }
+    return COMPILED_FILTERS[key]
+
+def normalize_text(txt: str) -> str:
+    """Minúsculas y sin acentos (NFKD sin marcas combinantes)"""
+    return COMBINING_RE.sub("", unicodedata.normalize("NFKD", txt.lower()))
+
+def text_matches(txt: str, flt) -> bool:
+    if not isinstance(txt, str) or not txt:
+        return False
+    # Se normaliza una sola vez: el prefiltro y la regex usan el mismo texto
+    norm = normalize_text(txt)
+    # Prefiltro (la mayoría de los textos no menciona a nadie): Aho-Corasick si está
+    # disponible; si no, búsqueda de subcadenas de str (en C), mucho más barata que la regex
+    if flt["ac"] is not None:
+        if not flt["ac"].find_matches_as_indexes(norm):
+            return False
+    elif flt["keywords"] and not any(k in norm for k in flt["keywords"]):
+        return False
+    return bool(flt["regex"].search(norm))
+
+def texts_match(texts, flt) -> list:
+    """Versión vectorizada de text_matches para una lista de textos.
+
+    Misma normalización (mismo rango de diacríticos), mismo prefiltro de palabras clave y
+    la misma regex compilada que text_matches: un texto da igual como post o comentario,
+    esté o no pyarrow. Arrow solo vectoriza la normalización y el prefiltro.
+    """
+    if pa is not None:
+        # Normalización y prefiltro en kernels de Arrow sobre un buffer UTF-8 contiguo
+        norm = pc.utf8_normalize(pc.utf8_lower(pa.array(texts, type=pa.string())), "NFKD")
+        norm = pc.replace_substring_regex(norm, COMBINING_RE2, "")
+        if flt["keywords"]:
+            cand = pc.fill_null(pc.match_substring_regex(norm, flt["keywords_pattern"]), False).to_pylist()
+        else:
+            cand = [True] * len(texts)
+        norm = norm.to_pylist()
+    else:
+        norm = [normalize_text(t) if isinstance(t, str) else "" for t in texts]
+        cand = [not flt["keywords"] or any(k in n for k in flt["keywords"]) for n in norm]
+    # La regex solo corre sobre los candidatos (la mayoría de los textos no menciona a nadie)
+    return [bool(c and n and flt["regex"].search(n)) for c, n in zip(cand, norm)]
+
+# ============== 🧱 Buffers columnares ==============
+# Filas acumuladas por columna (dict de listas): el DataFrame se arma sin un dict por fila
+POST_COLS = (
+    "post_unique_id", "run_timestamp", "post_id", "subreddit", "title", "selftext",
+    "author", "permalink", "score", "num_comments", "flair", "created",
+)
+COMMENT_COLS = (
+    "comment_unique_id", "run_timestamp", "post_unique_id", "post_id",
+    "post_subreddit", "post_title", "post_url", "post_author", "post_selftext",
+    "post_score", "post_num_comments", "post_flair", "post_created", "comment_id",
+    "comment_author", "comment_body", "comment_score", "comment_created",
+)
+
+def new_buffer(columns):
+    return {col: [] for col in columns}
+
+def append_row(buf, values):
+    """Agrega una fila a un buffer columnar; values en el mismo orden que sus columnas"""
+    for col_values, value in zip(buf.values(), values):
+        col_values.append(value)
+
+def safe_author(a):
+    return str(a) if a is not None else "[deleted]"
+
+def hash_post_id(post_id, created_utc, author, title):
+    base = f"{post_id}|{int(created_utc or 0)}|{author}|{(title or '')[:80]}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+def hash_comment_id(post_id, comment_id, created_utc, author, body):
+    base = f"{post_id}|{comment_id}|{int(created_utc or 0)}|{author}|{(body or '')[:80]}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+# ============== 💾 Almacenamiento acumulado ==============
+def ids_index_path(csv_path):
+    return os.path.splitext(csv_path)[0] + "_ids.parquet"
+
+def load_seen_ids(csv_path, key):
+    """Set con las claves ya acumuladas: desde el índice Parquet de una columna si está al día,
+    si no desde el CSV (solo esa columna del historial)"""
+    if not os.path.exists(csv_path):
+        return set()
+    index_path = ids_index_path(csv_path)
+    if os.path.exists(index_path) and os.path.getmtime(index_path) >= os.path.getmtime(csv_path):
+        try:
+            return set(pd.read_parquet(index_path, columns=[key])[key])
+        except Exception as e:
+            print(f"⚠️ Índice {index_path} ilegible, se reconstruye desde el CSV: {e}")
+    return set(pd.read_csv(csv_path, usecols=[key], dtype=str)[key].dropna())
+
+def save_seen_ids(seen, csv_path, key):
+    """Guarda el índice de claves junto al CSV (opcional, requiere pyarrow o fastparquet)"""
+    try:
+        pd.DataFrame({key: sorted(seen)}).to_parquet(ids_index_path(csv_path), index=False)
+    except Exception as e:
+        print(f"⚠️ Índice de claves no guardado: {e}")
+
+def only_unseen(df, seen, key):
+    """Filas con clave nueva (ni en el historial ni repetidas en la corrida)"""
+    if df.empty:
+        return df
+    return df[~df[key].isin(seen)].drop_duplicates(subset=[key]).copy()
+
+def append_csv(df, csv_path):
+    """Agrega filas al CSV acumulado respetando el orden de columnas del encabezado existente"""
+    if df.empty:
+        return
+    if os.path.exists(csv_path):
+        header = pd.read_csv(csv_path, nrows=0).columns
+        df.reindex(columns=header).to_csv(csv_path, mode="a", header=False, index=False)
+    else:
+        df.to_csv(csv_path, index=False)
+
+LOW_CARDINALITY_COLS = ("subreddit", "post_subreddit", "author", "post_author",
+                        "comment_author", "flair", "post_flair")
+
+def append_parquet_part(df, dataset_dir, run_ts):
+    """Agrega df como un archivo más del dataset (dt=AAAA-MM-DD/part-HHMMSS.parquet) sin reescribir el historial"""
+    if df.empty:
+        return
+    day, hms = run_ts.split(" ")
+    part_dir = Path(dataset_dir) / f"dt={day}"
+    part_dir.mkdir(parents=True, exist_ok=True)
+    # Texto de baja cardinalidad como categoría -> columna dictionary<int32, string> en Parquet.
+    # Primero a "string": una columna toda None (p.ej. sin flair en la corrida) daría
+    # dictionary<null> y chocaría con el esquema de las otras particiones dt= al leer
+    cat_cols = [c for c in LOW_CARDINALITY_COLS if c in df.columns]
+    df = df.astype({c: "string" for c in cat_cols}).astype({c: "category" for c in cat_cols})
+    df.to_parquet(part_dir / f"part-{hms.replace(':', '')}.parquet", index=False, compression="zstd")
+
+def epochs_to_datetime(df, columns):
+    """Epoch UTC (segundos) -> fecha local sin zona, como datetime.fromtimestamp, en una pasada por columna"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = (pd.to_datetime(df[col], unit="s", utc=True, errors="coerce")
+                       .dt.tz_convert(tz.tzlocal()).dt.tz_localize(None))
+
+def to_int64(df, columns):
+    """Columnas numéricas como enteros con NA"""
+    for col in columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+
+# ============== 🧹 Sanitizar para Excel (caracteres no imprimibles) ==============
+CTRL_RE = re.compile(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]")
+
+def clean_excel_strings(df):
+    """Quita caracteres de control (no permitidos en Excel) de las columnas de texto, de forma vectorizada"""
+    df = df.copy()
+    for col in df.select_dtypes(include="object").columns:
+        inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+        if inferred not in ("string", "mixed", "empty"):
+            continue  # columna object sin texto (p.ej. solo números): nada que limpiar
+        if pa is not None and inferred == "string":
+            # Solo texto: búsqueda y reemplazo directo con los kernels UTF-8 (RE2) de Arrow,
+            # sin pasar por el accessor .str de pandas
+            arr = pa.array(df[col], type=pa.string(), from_pandas=True)
+            if pc.any(pc.match_substring_regex(arr, CTRL_RE.pattern)).as_py():
+                df[col] = pc.replace_substring_regex(arr, CTRL_RE.pattern, "").to_pandas().set_axis(df.index)
+            continue
+        # Casi ninguna celda trae caracteres de control: se reemplaza solo en las que sí
+        # (celdas que no son texto quedan fuera de la máscara y conservan su valor)
+        dirty = df[col].str.contains(CTRL_RE, regex=True, na=False)
+        if not dirty.any():
+            continue
+        df[col] = df[col].mask(dirty, df.loc[dirty, col].str.replace(CTRL_RE, "", regex=True))
+    return df
+
+# ============== 🚀 Scraping ==============
+def fetch_all_comments(submission, more_comments_threshold=0):
+    """Expande y devuelve todos los comentarios; los MoreComments con menos de
+    more_comments_threshold hijos no se expanden (0 = todos)."""
+    submission.comment_limit = None
+    submission.comment_sort = "new"
+    err = None
+    for i in range(max_retries):
+        try:
+            submission.comments.replace_more(limit=None, threshold=more_comments_threshold)
+            return submission.comments.list(), None
+        except (RequestException, ResponseException, ServerError) as e:
+            err = f"{type(e).__name__}: {e}"
+            sleep_s = base_backoff ** (i + 1)
+            print(f"   🔁 Retry {i+1}/{max_retries} expandiendo {submission.id} -> {err}. Esperando {sleep_s:.1f}s…")
+            time.sleep(sleep_s)
+        except (Forbidden, NotFound) as e:
+            err = f"{type(e).__name__}: {e}"
+            break
+        except Exception as e:
+            err = f"{type(e).__name__}: {e}"
+            break
+    return (submission.comments.list() if hasattr(submission.comments, "list") else []), err
+
+def scrape_subreddit(sr, posts_limit, run_ts, flt=None, more_comments_threshold=0):
+    """Recorre un subreddit con una sesión PRAW propia; devuelve los buffers (posts_rows, comments_rows).
+
+    Con flt solo se guardan los posts (título o cuerpo) y comentarios que lo cumplen.
+    """
+    reddit = acquire_reddit()
+    posts_rows = new_buffer(POST_COLS)
+    comments_rows = new_buffer(COMMENT_COLS)
+    print(f"📥 Recorriendo r/{sr} (hasta {posts_limit} posts recientes)…")
+    try:
+        for submission in reddit.subreddit(sr).new(limit=posts_limit):
+            if saltar_stickies and getattr(submission, "stickied", False):
+                continue
+
+            post_created_utc = getattr(submission, "created_utc", None)
+            post_author = safe_author(getattr(submission, "author", None))
+            post_title = getattr(submission, "title", "") or ""
+            post_selftext = getattr(submission, "selftext", "") or ""
+            post_url = f"https://reddit.com{submission.permalink}"
+            post_subreddit = str(submission.subreddit)
+            post_score = getattr(submission, "score", None)
+            post_num_comments = getattr(submission, "num_comments", None)
+            post_flair = getattr(submission, "link_flair_text", None)
+
+            # -------- filtro por nombres en título o cuerpo del post --------
+            if flt is not None and not (text_matches(post_title, flt) or text_matches(post_selftext, flt)):
+                # si el post no menciona, no seguimos a comentarios (optimiza tiempo/cupo)
+                continue
+
+            post_unique_id = hash_post_id(
+                submission.id, post_created_utc, post_author, post_title
+            )
+
+            append_row(posts_rows, (
+                post_unique_id, run_ts, submission.id, post_subreddit, post_title,
+                post_selftext, post_author, post_url, post_score, post_num_comments,
+                post_flair, post_created_utc,
+            ))
+
+            comments, err = fetch_all_comments(submission, more_comments_threshold)
+            got = len(comments)
+            if err:
+                print(f"   ⚠️ {submission.id}: {got} comentarios obtenidos de {post_num_comments} (motivo: {err})")
+            else:
+                print(f"   ✅ {submission.id}: {got} comentarios obtenidos (num_comments={post_num_comments})")
+
+            bodies = [getattr(c, "body", "") or "" for c in comments]
+            # filtro vectorizado sobre todos los cuerpos del post de una vez
+            keep = texts_match(bodies, flt) if flt is not None else [True] * len(bodies)
+            for c, c_body, c_keep in zip(comments, bodies, keep):
+                if not c_keep:
+                    continue  # solo comentarios que mencionan los nombres
+
+                c_created_utc = getattr(c, "created_utc", None)
+                c_author = safe_author(getattr(c, "author", None))
+                c_score = getattr(c, "score", None)
+
+                comment_unique_id = hash_comment_id(
+                    submission.id, c.id, c_created_utc, c_author, c_body
+                )
+
+                # --- variables del post + del comentario en una fila ---
+                append_row(comments_rows, (
+                    comment_unique_id, run_ts, post_unique_id, submission.id, post_subreddit,
+                    post_title, post_url, post_author, post_selftext, post_score,
+                    post_num_comments, post_flair, post_created_utc, c.id, c_author, c_body,
+                    c_score, c_created_utc,
+                ))
+
+        time.sleep(0.2)
+
+    except Exception as e:
+        print(f"⚠️ Error recorriendo r/{sr}: {e}")
+        time.sleep(1.0)
+    finally:
+        REDDIT_POOL.put(reddit)
+
+    return posts_rows, comments_rows
+
+def run(subreddits, suffix="", posts_limit=250, name_patterns=None, name_keywords=None, label="",
+        export_xlsx=False, more_comments_threshold=0):
+    """Scrapea una configuración y agrega las filas nuevas a los acumulados con sufijo `suffix`.
+
+    Con name_patterns (y sus name_keywords) solo se guardan posts y comentarios que mencionan
+    esos nombres; sin ellos, todos los posts y todos sus comentarios. Con export_xlsx=True
+    también se reescriben los .xlsx completos (lento con mucho historial).
+    more_comments_threshold > 0 deja sin expandir los MoreComments con menos hijos que ese
+    valor (1 request menos por cada uno); 0 = expandir todos (corpus completo).
+    """
+    flt = None
+    if name_patterns:
+        flt = compile_filter(name_patterns, name_keywords)
+
+    # Excel con 2 hojas (posts y comentarios separados)
+    acum_path_excel = os.path.join(downloads_folder, f"reddit_posts_comentarios{suffix}.xlsx")
+    # Excel flat (post + comentario en la misma fila)
+    flat_xlsx = os.path.join(downloads_folder, f"reddit_posts_comentarios_flat{suffix}.xlsx")
+    # CSV separados acumulativos
+    acum_posts_csv = os.path.join(downloads_folder, f"reddit_posts{suffix}.csv")
+    acum_comments_csv = os.path.join(downloads_folder, f"reddit_comentarios{suffix}.csv")
+    # Datasets Parquet append-only (una partición dt=AAAA-MM-DD por día de corrida)
+    posts_parquet_dir = os.path.join(downloads_folder, f"reddit_posts{suffix}_parquet")
+    comments_parquet_dir = os.path.join(downloads_folder, f"reddit_comentarios{suffix}_parquet")
+
+    # Solo las claves: el historial completo no se carga en memoria
+    seen_posts = load_seen_ids(acum_posts_csv, "post_unique_id")
+    seen_comments = load_seen_ids(acum_comments_csv, "comment_unique_id")
+
+    run_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"🚀 Iniciando scraping {label}…")
+
+    # Subreddits en paralelo: el tiempo se va en esperar la red, no en CPU. Pocos hilos,
+    # porque todos gastan el mismo cupo de Reddit (ver max_subreddit_workers)
+    posts_rows = new_buffer(POST_COLS)
+    comments_rows = new_buffer(COMMENT_COLS)
+    n_workers = max(1, min(len(subreddits), max_subreddit_workers))
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(lambda sr: scrape_subreddit(sr, posts_limit, run_ts, flt, more_comments_threshold), subreddits)
+        for sr_posts, sr_comments in results:
+            for col in POST_COLS:
+                posts_rows[col].extend(sr_posts[col])
+            for col in COMMENT_COLS:
+                comments_rows[col].extend(sr_comments[col])
+
+    # --- DataFrames nuevos (sin claves ya acumuladas) ---
+    df_posts_new = only_unseen(pd.DataFrame(posts_rows), seen_posts, "post_unique_id")
+    df_comments_new = only_unseen(pd.DataFrame(comments_rows), seen_comments, "comment_unique_id")
+
+    # --- Asegurar tipos numéricos y de fecha ---
+    to_int64(df_posts_new, ["score", "num_comments"])
+    to_int64(df_comments_new, ["post_score", "post_num_comments", "comment_score"])
+    epochs_to_datetime(df_posts_new, ["created"])
+    epochs_to_datetime(df_comments_new, ["post_created", "comment_created"])
+
+    # --- Agregar filas nuevas a los CSVs acumulativos separados ---
+    append_csv(df_posts_new, acum_posts_csv)
+    append_csv(df_comments_new, acum_comments_csv)
+    seen_posts.update(df_posts_new.get("post_unique_id", []))
+    seen_comments.update(df_comments_new.get("comment_unique_id", []))
+    if os.path.exists(acum_posts_csv):
+        save_seen_ids(seen_posts, acum_posts_csv, "post_unique_id")
+    if os.path.exists(acum_comments_csv):
+        save_seen_ids(seen_comments, acum_comments_csv, "comment_unique_id")
+
+    # Guardar Parquet: solo las filas nuevas de esta corrida (opcional, requiere pyarrow o fastparquet)
+    try:
+        append_parquet_part(df_posts_new, posts_parquet_dir, run_ts)
+        append_parquet_part(df_comments_new, comments_parquet_dir, run_ts)
+        parquet_saved = True
+    except ImportError as e:
+        print(f"⚠️ Parquet omitido: {e}")
+        parquet_saved = False
+    except Exception as e:
+        print(f"⚠️ Error guardando Parquet: {e}")
+        parquet_saved = False
+
+    # --- Guardar Excel (opcional, si hay motor disponible) ---
+    if export_xlsx and WRITER_ENGINE:
+        # El Excel sí necesita el historial completo
+        df_posts_final = clean_excel_strings(pd.read_csv(acum_posts_csv)) if os.path.exists(acum_posts_csv) else pd.DataFrame()
+        df_comments_final = clean_excel_strings(pd.read_csv(acum_comments_csv)) if os.path.exists(acum_comments_csv) else pd.DataFrame()
+
+        with pd.ExcelWriter(acum_path_excel, engine=WRITER_ENGINE) as writer:
+            df_posts_final.to_excel(writer, sheet_name="posts", index=False)
+            df_comments_final.to_excel(writer, sheet_name="comentarios", index=False)
+
+        with pd.ExcelWriter(flat_xlsx, engine=WRITER_ENGINE) as writer:
+            df_comments_final.to_excel(writer, sheet_name="posts_comentarios", index=False)
+    elif export_xlsx:
+        print("ℹ️ Excel omitido por falta de motor (instala 'openpyxl' o 'xlsxwriter'). Mantuvimos CSVs.")
+
+    # --- Reporte ---
+    print(f"\n✅ Resumen de la corrida {label}")
+    print(f"   • Nuevos posts en esta corrida:      {len(df_posts_new)}")
+    print(f"   • Nuevos comentarios en esta corrida:{len(df_comments_new)}")
+    print(f"   • Total posts acumulados:            {len(seen_posts)}")
+    print(f"   • Total comentarios acumulados:      {len(seen_comments)}")
+    print(f"💾 CSV posts:        {acum_posts_csv}")
+    print(f"💾 CSV comentarios:  {acum_comments_csv}")
+    if parquet_saved:
+        print(f"📦 Parquet posts:    {posts_parquet_dir}")
+        print(f"📦 Parquet comentarios: {comments_parquet_dir}")
+    if export_xlsx and WRITER_ENGINE:
+        print(f"📘 Excel (2 sheets): {acum_path_excel}")
+        print(f"📘 Excel (flat 1 sheet): {flat_xlsx}")
+
+    return df_posts_new, df_comments_new